@@ -12,6 +12,7 @@ from ttkbootstrap.dialogs import Messagebox
 from ttkbootstrap.scrolled import ScrolledText
 
 from .converter import (
+    CONTENT_CATEGORIES,
     ConversionResult,
     convert_batch,
     convert_world,
@@ -41,6 +42,14 @@ class App(ttk.Frame):
                 "direction_label": "Direction:",
                 "target_ver_label": "Target Ver:",
                 "force_repair": "Force Repair (Re-save chunks)",
+                "verify_output": "Verify Output (compare with source)",
+                "scope_label": "Content:",
+                "scope_blocks": "Blocks",
+                "scope_biomes": "Biomes",
+                "scope_block_entities": "Block Entities",
+                "scope_entities": "Entities",
+                "scope_players": "Player Data",
+                "scope_maps": "Maps",
                 "input_world": "Input World:",
                 "output_folder": "Output Folder:",
                 "browse": "📁 Browse",
@@ -75,6 +84,14 @@ class App(ttk.Frame):
                 "direction_label": "转换方向：",
                 "target_ver_label": "目标版本：",
                 "force_repair": "强制修复（重新保存区块）",
+                "verify_output": "校验输出（与源存档比对）",
+                "scope_label": "转换内容：",
+                "scope_blocks": "方块",
+                "scope_biomes": "生物群系",
+                "scope_block_entities": "方块实体",
+                "scope_entities": "实体",
+                "scope_players": "玩家数据",
+                "scope_maps": "地图",
                 "input_world": "输入存档：",
                 "output_folder": "输出位置：",
                 "browse": "📁 浏览",
@@ -107,6 +124,10 @@ class App(ttk.Frame):
         self.version_var = tk.StringVar(value=self._t("latest"))
         self.batch_output_var = tk.StringVar()
         self.repair_var = tk.BooleanVar(value=False)
+        self.verify_var = tk.BooleanVar(value=False)
+        self.scope_vars = {
+            category: tk.BooleanVar(value=True) for category in CONTENT_CATEGORIES
+        }
         self.status_var = tk.StringVar()
         
         # Internal State
@@ -237,11 +258,35 @@ class App(ttk.Frame):
         self.version_combo.grid(row=0, column=3, sticky=W, padx=5)
 
         # Row 1: Extra Options
+        extra_frame = ttk.Frame(opt_container)
+        extra_frame.grid(row=1, column=1, columnspan=3, sticky=W, padx=7, pady=10)
+
         self.chk_force_repair = ttk.Checkbutton(
-            opt_container,
+            extra_frame,
             variable=self.repair_var,
         )
-        self.chk_force_repair.grid(row=1, column=1, columnspan=3, sticky=W, padx=7, pady=10)
+        self.chk_force_repair.pack(side=LEFT)
+
+        self.chk_verify = ttk.Checkbutton(
+            extra_frame,
+            variable=self.verify_var,
+        )
+        self.chk_verify.pack(side=LEFT, padx=(20, 0))
+
+        # Row 2: Content Scope (blocks are always converted)
+        self.lbl_scope = ttk.Label(opt_container)
+        self.lbl_scope.grid(row=2, column=0, sticky=E, padx=5, pady=5)
+
+        scope_frame = ttk.Frame(opt_container)
+        scope_frame.grid(row=2, column=1, columnspan=3, sticky=W, padx=5)
+
+        self.chk_scope = {}
+        for category in CONTENT_CATEGORIES:
+            chk = ttk.Checkbutton(scope_frame, variable=self.scope_vars[category])
+            chk.pack(side=LEFT, padx=2)
+            if category == "blocks":
+                chk.configure(state=DISABLED)
+            self.chk_scope[category] = chk
 
     def _setup_single_tab(self) -> None:
         # Input
@@ -350,6 +395,8 @@ class App(ttk.Frame):
         direction = self.direction_var.get()
         target_version = self._normalize_version()
         force_repair = self.repair_var.get()
+        content_scope = [c for c, var in self.scope_vars.items() if var.get()]
+        verify = self.verify_var.get()
 
         # Mode Specifics
         if mode == "single":
@@ -364,7 +411,7 @@ class App(ttk.Frame):
                 confirm = Messagebox.show_question(self._t("warn_output_nonempty"), self._t("warn_confirm_overwrite"))
                 if confirm != "Yes": return
             
-            args = (mode, inp, out, direction, target_version, force_repair)
+            args = (mode, inp, out, direction, target_version, force_repair, content_scope, verify)
             
         else: # batch
             if not self._input_paths:
@@ -375,7 +422,7 @@ class App(ttk.Frame):
                 Messagebox.show_warning(self._t("warn_select_output_root"), self._t("warn_input_error"))
                 return
             
-            args = (mode, self._input_paths, out, direction, target_version, force_repair)
+            args = (mode, self._input_paths, out, direction, target_version, force_repair, content_scope, verify)
 
         # UI State Lock
         self._lock_ui(True)
@@ -402,6 +449,8 @@ class App(ttk.Frame):
         direction: str,
         target_version: str | None,
         force_repair: bool,
+        content_scope: list[str],
+        verify: bool,
     ) -> None:
         try:
             if mode == "batch":
@@ -412,6 +461,8 @@ class App(ttk.Frame):
                     target_version=target_version,
                     force_repair=force_repair,
                     log=self._log_queue.put,
+                    content_scope=content_scope,
+                    verify=verify,
                 )
             else:
                 result = convert_world(
@@ -421,6 +472,8 @@ class App(ttk.Frame):
                     target_version=target_version,
                     force_repair=force_repair,
                     log=self._log_queue.put,
+                    content_scope=content_scope,
+                    verify=verify,
                 )
             self._result_queue.put(result)
         except Exception as e:
@@ -491,6 +544,10 @@ class App(ttk.Frame):
         self.lbl_direction.configure(text=self._t("direction_label"))
         self.lbl_target_ver.configure(text=self._t("target_ver_label"))
         self.chk_force_repair.configure(text=self._t("force_repair"))
+        self.chk_verify.configure(text=self._t("verify_output"))
+        self.lbl_scope.configure(text=self._t("scope_label"))
+        for category, chk in self.chk_scope.items():
+            chk.configure(text=self._t(f"scope_{category}"))
         self.lbl_input.configure(text=self._t("input_world"))
         self.lbl_output.configure(text=self._t("output_folder"))
         self.btn_browse_input.configure(text=self._t("browse"))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterable, Optional
+
+from .converter import Direction, _resolve_target_platform, convert_world
+from .logs import LogFn
+from .output import OutputOptions
+
+
+@dataclass
+class BenchmarkRow:
+    label: str
+    options: OutputOptions
+    success: bool
+    seconds: float
+    size: int
+    message: str = ""
+
+
+def default_variants(target_platform: str) -> list[tuple[str, OutputOptions]]:
+    if target_platform == "java":
+        return [
+            ("zlib-1", OutputOptions(region_compression="zlib", compression_level=1)),
+            ("zlib-6", OutputOptions(region_compression="zlib", compression_level=6)),
+            ("zlib-9", OutputOptions(region_compression="zlib", compression_level=9)),
+            ("gzip-6", OutputOptions(region_compression="gzip", compression_level=6)),
+            ("none", OutputOptions(region_compression="none")),
+        ]
+    return [
+        ("batch-1", OutputOptions(leveldb_batch_size=1)),
+        ("batch-64", OutputOptions(leveldb_batch_size=64)),
+        ("batch-256", OutputOptions(leveldb_batch_size=256)),
+        ("batch-256+compact", OutputOptions(leveldb_batch_size=256, compact_leveldb=True)),
+    ]
+
+
+def benchmark_output_options(
+    input_path: str | Path,
+    direction: Direction,
+    variants: Optional[Iterable[tuple[str, OutputOptions]]] = None,
+    target_version: Optional[str] = None,
+    log: Optional[LogFn] = None,
+) -> list[BenchmarkRow]:
+    if variants is None:
+        variants = default_variants(_resolve_target_platform(direction))
+
+    rows: list[BenchmarkRow] = []
+    for label, options in variants:
+        with TemporaryDirectory(prefix="mcconvert-bench-") as tempdir:
+            output_path = Path(tempdir) / "world"
+            started = time.perf_counter()
+            result = convert_world(
+                input_path=input_path,
+                output_path=output_path,
+                direction=direction,
+                target_version=target_version,
+                output_options=options,
+            )
+            seconds = time.perf_counter() - started
+            size = _directory_size(output_path)
+        rows.append(BenchmarkRow(label, options, result.success, seconds, size, result.message))
+        if log is not None:
+            log(format_row(rows[-1]))
+    return rows
+
+
+def format_row(row: BenchmarkRow) -> str:
+    status = "ok" if row.success else f"失败: {row.message}"
+    return f"{row.label:<20} {row.seconds:>9.2f} s {row.size / 1024 / 1024:>10.2f} MiB  {status}"
+
+
+def _directory_size(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m mcconvert_ui.benchmark",
+        description="Report conversion time and output size for each output setting.",
+    )
+    parser.add_argument("world", help="source world folder")
+    parser.add_argument(
+        "--direction",
+        required=True,
+        choices=["bedrock-to-java", "java-to-bedrock", "java-to-java", "bedrock-to-bedrock"],
+    )
+    parser.add_argument("--target-version", default=None)
+    args = parser.parse_args(argv)
+
+    print(f"{'setting':<20} {'time':>11} {'size':>14}")
+    benchmark_output_options(
+        args.world,
+        args.direction,
+        target_version=args.target_version,
+        log=print,
+    )
+
+
+if __name__ == "__main__":
+    main()
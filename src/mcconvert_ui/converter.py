@@ -2,18 +2,76 @@ from __future__ import annotations
 
 import importlib
 import shutil
+import threading
+import time
 import traceback
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Iterable, Literal, Optional
 
+from .logs import LogFn, emit_log as _log
+from .output import OutputOptions, anvil_compression, tuned_leveldb
+from .passthrough import AssetPassthrough
+from .readers import (
+    BEDROCK_BATCH_SIZE,
+    AnvilRegionReader,
+    BedrockRangeReader,
+    ChunkStream,
+    PrefetchedChunks,
+    bedrock_chunk_plan,
+)
+from .scan import java_dimension_dirs, read_region_header, region_files
+from .staging import IOThrottle, copy_file, copy_tree, job_throttle, publish, staging_path
+from .verify import verify_conversion
+
 Direction = Literal[
     "bedrock-to-java",
     "java-to-bedrock",
     "java-to-java",
     "bedrock-to-bedrock",
 ]
-LogFn = Callable[[str], None]
+
+READ_AHEAD_WORKERS = 4
+# Chunks committed between two flushes (save and unload) of the wrappers.
+_SAVE_INTERVAL = 4096
+
+CONTENT_CATEGORIES: tuple[str, ...] = (
+    "blocks",
+    "biomes",
+    "block_entities",
+    "entities",
+    "players",
+    "maps",
+)
+TERRAIN_SCOPE: frozenset[str] = frozenset({"blocks", "biomes"})
+
+_CATEGORY_LABELS = {
+    "blocks": "方块",
+    "biomes": "生物群系",
+    "block_entities": "方块实体",
+    "entities": "实体",
+    "players": "玩家数据",
+    "maps": "地图",
+}
+# Raw payloads that belong to each optional category.  Bedrock chunk data is
+# keyed by the LevelDB record tag, Anvil chunk data by layer folder and NBT key.
+_BEDROCK_CATEGORY_KEYS = {
+    "biomes": (b"+", b"-", b"."),
+    "block_entities": (b"1",),
+    "entities": (b"2", b"digp"),
+}
+_ANVIL_CATEGORY_LAYERS = {
+    "entities": ("entities",),
+}
+_ANVIL_CATEGORY_TAGS = {
+    "biomes": ("Biomes",),
+    "block_entities": ("TileEntities", "block_entities"),
+    "entities": ("Entities",),
+}
+_ANVIL_SECTION_CATEGORY_TAGS = {
+    "biomes": ("biomes",),
+}
 
 
 class ConversionError(RuntimeError):
@@ -25,6 +83,7 @@ class ConversionResult:
     success: bool
     message: str
     details: Optional[str] = None
+    stats: dict = field(default_factory=dict)
 
 
 def convert_world(
@@ -34,6 +93,12 @@ def convert_world(
     target_version: Optional[str] = None,
     force_repair: bool = False,
     log: Optional[LogFn] = None,
+    content_scope: Optional[Iterable[str]] = None,
+    output_options: Optional[OutputOptions] = None,
+    verify: bool = False,
+    staging_dir: Optional[str | Path] = None,
+    io_limit: Optional[float] = None,
+    read_ahead: int = 64,
 ) -> ConversionResult:
     input_path = Path(input_path).expanduser().resolve()
     output_path = Path(output_path).expanduser().resolve()
@@ -41,6 +106,13 @@ def convert_world(
     _log(log, f"输入路径: {input_path}")
     _log(log, f"输出路径: {output_path}")
 
+    try:
+        scope = _normalize_content_scope(content_scope)
+        if output_options is not None:
+            output_options.validate()
+    except (ConversionError, ValueError) as exc:
+        return ConversionResult(False, str(exc))
+
     if not input_path.exists():
         return ConversionResult(False, "输入路径不存在。")
     if not input_path.is_dir():
@@ -50,9 +122,78 @@ def convert_world(
             return ConversionResult(False, "输出路径必须是文件夹。")
         if any(output_path.iterdir()):
             return ConversionResult(False, "输出路径非空，请选择空目录。")
-    else:
+
+    options = dict(
+        direction=direction,
+        target_version=target_version,
+        force_repair=force_repair,
+        log=log,
+        scope=scope,
+        output_options=output_options,
+        read_ahead=read_ahead,
+    )
+    if staging_dir is None:
+        if io_limit:
+            # Only the copies this package makes itself can be throttled.
+            _log(log, "未设置暂存目录: io_limit 只限制资源复制，Amulet 写入输出路径的流量不受限速。")
         output_path.mkdir(parents=True, exist_ok=True)
+        result = _convert_into(input_path, output_path, throttle=job_throttle(io_limit), **options)
+        if verify and result.success:
+            _verify_output(result, input_path, output_path, log)
+        return result
+
+    # Convert on fast scratch storage, then move the finished world into place
+    # so consumers never observe a half-written output.
+    staged = staging_path(Path(staging_dir).expanduser().resolve(), output_path)
+    _log(log, f"暂存路径: {staged}")
+    try:
+        # Fail before converting rather than when publishing the result.
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        staged.mkdir(parents=True)
+        result = _convert_into(input_path, staged, throttle=None, **options)
+        if result.success:
+            _log(log, "正在发布到输出路径...")
+            publish(staged, output_path, job_throttle(io_limit))
+            _log(log, "已发布到输出路径。")
+    except Exception:
+        return ConversionResult(False, "发布转换结果失败。", details=traceback.format_exc())
+    finally:
+        shutil.rmtree(staged, ignore_errors=True)
+    # Verified after publishing, so a failed check still leaves the output
+    # in place for inspection.
+    if verify and result.success:
+        _verify_output(result, input_path, output_path, log)
+    return result
 
+
+def _verify_output(
+    result: ConversionResult, input_path: Path, output_path: Path, log: Optional[LogFn]
+) -> None:
+    report = verify_conversion(
+        input_path,
+        output_path,
+        log=log,
+        skipped_dimensions=result.stats.get("skipped_dimensions", ()),
+    )
+    result.stats["verification"] = report.as_dict()
+    if not report.ok:
+        result.success = False
+        result.message = "转换已完成，但输出校验发现差异。"
+        result.details = report.summary()
+
+
+def _convert_into(
+    input_path: Path,
+    output_path: Path,
+    direction: Direction,
+    target_version: Optional[str],
+    force_repair: bool,
+    log: Optional[LogFn],
+    scope: frozenset[str],
+    output_options: Optional[OutputOptions],
+    read_ahead: int,
+    throttle: Optional[IOThrottle],
+) -> ConversionResult:
     try:
         amulet = importlib.import_module("amulet")
     except Exception as exc:  # pragma: no cover - depends on runtime
@@ -74,16 +215,33 @@ def convert_world(
         current_platform = _get_level_platform(level)
         if current_platform:
             _log(log, f"检测到源平台: {current_platform}")
-        if current_platform == target_platform and not force_repair and not target_version:
+        if (
+            current_platform == target_platform
+            and not force_repair
+            and not target_version
+            and scope == frozenset(CONTENT_CATEGORIES)
+            and output_options is None
+        ):
             _log(log, "检测到目标平台与源平台一致，直接复制存档。")
-            _copy_world_folder(input_path, output_path)
-            return ConversionResult(True, "已完成复制。")
-
-        _log(log, "开始尝试转换存档格式。")
-        _convert_with_best_effort(
-            amulet, level, output_path, target_platform, target_version, log
-        )
-        return ConversionResult(True, "转换完成。")
+            _copy_world_folder(input_path, output_path, throttle)
+            result = ConversionResult(True, "已完成复制。")
+        else:
+            _log(log, "开始尝试转换存档格式。")
+            stats = _convert_with_best_effort(
+                amulet,
+                level,
+                output_path,
+                target_platform,
+                target_version,
+                log,
+                scope,
+                input_path=input_path,
+                source_platform=current_platform,
+                output_options=output_options,
+                read_ahead=read_ahead,
+                throttle=throttle,
+            )
+            result = ConversionResult(True, "转换完成。", stats=stats)
     except ConversionError as exc:
         return ConversionResult(False, str(exc))
     except Exception as exc:
@@ -93,6 +251,7 @@ def convert_world(
             level.close()
         except Exception:
             pass
+    return result
 
 
 def _convert_with_best_effort(
@@ -102,29 +261,422 @@ def _convert_with_best_effort(
     target_platform: str,
     target_version: Optional[str],
     log: Optional[LogFn],
-) -> None:
+    scope: frozenset[str] = frozenset(CONTENT_CATEGORIES),
+    input_path: Optional[Path] = None,
+    source_platform: Optional[str] = None,
+    output_options: Optional[OutputOptions] = None,
+    read_ahead: int = 0,
+    throttle: Optional[IOThrottle] = None,
+) -> dict:
     wrapper = _create_world_wrapper(target_platform, output_path, target_version, log)
     _log(log, f"已创建目标格式包装器: {wrapper.__class__.__name__}")
+    if output_options is not None:
+        _log(log, f"输出设置: {output_options.describe()}")
+
+    passthrough = None
+    excluded = frozenset(CONTENT_CATEGORIES) - scope
+    stats: dict = {
+        "scope": sorted(scope),
+        "chunks": 0,
+        "skipped_payloads": 0,
+        "skipped_bytes": 0,
+        "payload_bytes": 0,
+        "unread_bytes": 0,
+    }
+    if excluded:
+        labels = "、".join(_CATEGORY_LABELS[c] for c in CONTENT_CATEGORIES if c in scope)
+        _log(log, f"内容范围: {labels}（其余数据不解码、不转换）")
+
+    level_wrapper = getattr(level, "level_wrapper", None)
+    # Like save_iter, dimensions the target format does not have (such as
+    # datapack dimensions going to Bedrock) are not converted.
+    stats["skipped_dimensions"] = _unsupported_dimensions(level_wrapper, wrapper)
+    for dimension in stats["skipped_dimensions"]:
+        _log(log, f"目标存档不支持维度 {dimension}，已跳过。")
+    # amulet's own raw reader, before the scope filter wraps it.
+    raw_reader = getattr(level_wrapper, "_get_raw_chunk_data", None)
+    started = time.perf_counter()
+    with anvil_compression(output_options, log):
+        try:
+            # Non-chunk assets are copied on a background pool while chunks
+            # translate.
+            if input_path is not None:
+                passthrough = AssetPassthrough(
+                    input_path,
+                    output_path,
+                    source_platform,
+                    target_platform,
+                    scope,
+                    log,
+                    throttle=throttle,
+                ).start()
+            with tuned_leveldb(wrapper, output_options, log):
+                with _filter_raw_chunks(level_wrapper, excluded, stats) as strip:
+                    plan = _read_ahead_plan(
+                        level_wrapper,
+                        wrapper,
+                        source_platform,
+                        read_ahead,
+                        raw_reader,
+                        excluded,
+                        strip,
+                        stats,
+                        log,
+                    )
+                    if plan is not None:
+                        _log(log, f"使用预读流水线进行转换 (预读深度 {read_ahead})...")
+                        stats["chunks"] = _log_save_progress(
+                            _transfer_chunks(level_wrapper, wrapper, plan, read_ahead, stats),
+                            log,
+                        )
+                    elif hasattr(level, "save_iter"):
+                        _log(log, "使用 save_iter 进行转换...")
+                        stats["chunks"] = _log_save_progress(
+                            level.save_iter(wrapper), log
+                        )
+                    elif hasattr(level, "save"):
+                        _log(log, "使用 save 进行转换...")
+                        level.save(wrapper)
+                    else:
+                        raise ConversionError("当前存档对象不支持保存接口。")
+                if passthrough is not None:
+                    stats["records"] = passthrough.copy_bedrock_records(
+                        getattr(level_wrapper, "level_db", None),
+                        getattr(wrapper, "level_db", None),
+                    )
+        except Exception as exc:
+            details = traceback.format_exc()
+            raise ConversionError(f"转换失败: {exc}\n{details}")
+        finally:
+            try:
+                wrapper.close()
+            except Exception:
+                pass
+            if passthrough is not None:
+                stats["assets"] = passthrough.wait()
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed"] = elapsed
+    rate = stats["chunks"] / elapsed if elapsed > 0 else 0.0
+    _log(log, f"区块转换耗时 {elapsed:.1f} 秒 ({rate:.1f} 区块/秒)")
+    if excluded and stats["payload_bytes"]:
+        # Uncompressed bytes of chunk data that reached amulet and were dropped
+        # before decoding, against the total it would otherwise have decoded.
+        stats["skipped_share"] = stats["skipped_bytes"] / stats["payload_bytes"]
+        skipped_mib = stats["skipped_bytes"] / 1024 / 1024
+        total_mib = stats["payload_bytes"] / 1024 / 1024
+        _log(
+            log,
+            f"已跳过 {stats['skipped_payloads']} 项未选中的区块数据: "
+            f"{skipped_mib:.1f} MiB / {total_mib:.1f} MiB（未压缩，占 {stats['skipped_share']:.0%}）",
+        )
+    if stats["unread_bytes"]:
+        # Whole layers are not read at all; their size is only known on disk.
+        unread_mib = stats["unread_bytes"] / 1024 / 1024
+        _log(log, f"未读取的区域文件层: 磁盘上共 {unread_mib:.1f} MiB（压缩后大小）")
+    if stats.get("failed_chunks"):
+        _log(log, f"有 {stats['failed_chunks']} 个区块无法读取，已跳过")
+    return stats
+
+
+def _read_ahead_plan(
+    level_wrapper,
+    wrapper,
+    source_platform: Optional[str],
+    read_ahead: int,
+    raw_reader: Optional[Callable],
+    excluded: frozenset[str],
+    strip: Callable,
+    stats: dict,
+    log: Optional[LogFn],
+) -> Optional[list[ChunkStream]]:
+    if read_ahead <= 0 or level_wrapper is None:
+        return None
+    if not (
+        hasattr(level_wrapper, "_get_raw_chunk_data")
+        and hasattr(level_wrapper, "load_chunk")
+        and hasattr(wrapper, "commit_chunk")
+    ):
+        return None
+    try:
+        skipped = set(stats["skipped_dimensions"])
+        dimensions = [d for d in level_wrapper.dimensions if d not in skipped]
+        if source_platform == "bedrock":
+            return _bedrock_chunk_plan(level_wrapper, raw_reader, dimensions, strip, log)
+        if source_platform == "java":
+            return _anvil_chunk_plan(
+                level_wrapper, raw_reader, dimensions, excluded, strip, stats, log
+            )
+    except Exception:
+        _log(log, "预读计划生成失败，改用 save_iter。")
+    return None
+
 
+def _unsupported_dimensions(level_wrapper, wrapper) -> list[str]:
     try:
-        if hasattr(level, "save_iter"):
-            _log(log, "使用 save_iter 进行转换...")
-            _log_save_progress(level.save_iter(wrapper), log)
-        elif hasattr(level, "save"):
-            _log(log, "使用 save 进行转换...")
-            level.save(wrapper)
+        targets = set(wrapper.dimensions)
+        return [d for d in level_wrapper.dimensions if d not in targets]
+    except Exception:
+        return []
+
+
+def _bedrock_chunk_plan(
+    level_wrapper,
+    raw_reader: Callable,
+    dimensions: list[str],
+    strip: Callable,
+    log: Optional[LogFn],
+) -> Optional[list[ChunkStream]]:
+    level_db = getattr(level_wrapper, "level_db", None)
+    if level_db is None:
+        return None
+    streams = bedrock_chunk_plan(level_db, dimensions)
+    for stream in streams:
+        if not stream.coords:
+            continue
+        # Range scans go straight to the LevelDB handle; they are only used
+        # when they return exactly what amulet's own reader returns.
+        key = stream.coords[0]
+        expected = raw_reader(*key, stream.dimension)
+        range_reader = BedrockRangeReader(level_db, stream.dimension, type(expected))
+        found = range_reader.read([key]).get(key)
+        if found == expected and getattr(found, "entity_actor", None) == getattr(
+            expected, "entity_actor", None
+        ):
+            stream.fetch = lambda keys, r=range_reader: {
+                k: strip(raw) for k, raw in r.read(keys).items()
+            }
+            stream.batch_size = BEDROCK_BATCH_SIZE
         else:
-            raise ConversionError("当前存档对象不支持保存接口。")
-    except Exception as exc:
-        details = traceback.format_exc()
-        raise ConversionError(f"转换失败: {exc}\n{details}")
+            _log(log, f"{stream.dimension}: 数据库记录布局未知，改用 Amulet 读取。")
+    return streams
+
+
+def _anvil_chunk_plan(
+    level_wrapper,
+    raw_reader: Callable,
+    dimensions: list[str],
+    excluded: frozenset[str],
+    strip: Callable,
+    stats: dict,
+    log: Optional[LogFn],
+) -> list[ChunkStream]:
+    world = Path(level_wrapper.path)
+    directories = java_dimension_dirs(world)
+    # Layers of excluded categories are not even inflated.
+    skipped_layers = {
+        layer for category in excluded for layer in _ANVIL_CATEGORY_LAYERS.get(category, ())
+    }
+    layers = tuple(layer for layer in ("region", "entities") if layer not in skipped_layers)
+    streams: list[ChunkStream] = []
+    for dimension in dimensions:
+        directory = directories.get(dimension)
+        if directory is None:
+            coords = list(level_wrapper.all_chunk_coords(dimension))
+            streams.append(ChunkStream(dimension, coords))
+            continue
+        # Skipped layers never reach strip(); their sectors on disk are what
+        # is saved, which is not comparable with the uncompressed sizes.
+        for layer in skipped_layers:
+            for path in region_files(directory, layer):
+                stats["unread_bytes"] += sum(e.size for e in read_region_header(path))
+        region_reader = AnvilRegionReader(directory, layers)
+        stream = ChunkStream(dimension, region_reader.coords, close=region_reader.close)
+        # Only hand amulet data shaped exactly like its own raw reader's.
+        if region_reader.coords:
+            cx, cz = region_reader.coords[0]
+            expected = set(raw_reader(cx, cz, dimension))
+            if expected and expected <= {"region", "entities"}:
+                stream.fetch = lambda keys, r=region_reader: {
+                    key: strip(r.read(key)) for key in keys
+                }
+            else:
+                _log(log, f"{dimension}: 区域文件布局未知，改用 Amulet 读取。")
+        streams.append(stream)
+    return streams
+
+
+def _transfer_chunks(
+    level_wrapper,
+    wrapper,
+    plan: list[ChunkStream],
+    read_ahead: int,
+    stats: dict,
+):
+    # Raw chunk reads (LevelDB range scans for Bedrock; inflating and NBT
+    # parsing for Anvil) run on worker threads ahead of the translator without
+    # touching amulet.  amulet's decode and translation stay on this thread
+    # because its format interfaces are not thread-safe.
+    total = sum(len(stream.coords) for stream in plan)
+    done = 0
+    prefetched = PrefetchedChunks(level_wrapper)
+    with prefetched.installed(), _closing_streams(plan):
+        for stream in plan:
+            dimension = stream.dimension
+            for (cx, cz), raw in stream.prefetch(
+                workers=min(READ_AHEAD_WORKERS, read_ahead), depth=read_ahead
+            ):
+                done += 1
+                if raw is not None:
+                    prefetched.put(cx, cz, dimension, raw)
+                try:
+                    chunk = level_wrapper.load_chunk(cx, cz, dimension)
+                except Exception:
+                    prefetched.discard(cx, cz, dimension)
+                    stats["failed_chunks"] = stats.get("failed_chunks", 0) + 1
+                else:
+                    wrapper.commit_chunk(chunk, dimension)
+                    if done % _SAVE_INTERVAL == 0:
+                        _flush_output(level_wrapper, wrapper)
+                yield done, total
+    _flush_output(level_wrapper, wrapper)
+
+
+def _flush_output(level_wrapper, wrapper) -> None:
+    # The same checkpoint save_iter makes: write the output, then drop the
+    # chunks both wrappers cache so memory does not grow with world size.
+    wrapper.save()
+    for target in (level_wrapper, wrapper):
+        unload = getattr(target, "unload", None)
+        if unload is not None:
+            unload()
+
+
+@contextmanager
+def _closing_streams(plan: list[ChunkStream]):
+    # Every stream is closed exactly once, when the transfer ends or fails.
+    try:
+        yield
+    finally:
+        for stream in plan:
+            if stream.close is not None:
+                stream.close()
+
+
+def _normalize_content_scope(content_scope: Optional[Iterable[str]]) -> frozenset[str]:
+    if content_scope is None:
+        return frozenset(CONTENT_CATEGORIES)
+    if isinstance(content_scope, str):
+        content_scope = [content_scope]
+    scope = {str(c).strip() for c in content_scope if str(c).strip()}
+    unknown = scope - set(CONTENT_CATEGORIES)
+    if unknown:
+        raise ConversionError(f"未知的内容范围: {', '.join(sorted(unknown))}")
+    # Blocks are the backbone of a chunk and are always converted.
+    scope.add("blocks")
+    return frozenset(scope)
+
+
+@contextmanager
+def _filter_raw_chunks(level_wrapper, excluded: frozenset[str], stats: dict):
+    # Excluded categories are dropped from the raw chunk data before amulet
+    # decodes it, so they are never parsed or translated.
+    # Yields the strip function so other raw readers can apply the same filter.
+    reader = getattr(level_wrapper, "_get_raw_chunk_data", None)
+    if not excluded or reader is None:
+        yield lambda raw: raw
+        return
+
+    lock = threading.Lock()
+
+    def strip(raw):
+        removed = _strip_raw_chunk(raw, excluded)
+        kept = _raw_chunk_size(raw)
+        with lock:
+            stats["skipped_payloads"] += len(removed)
+            stats["skipped_bytes"] += sum(removed)
+            stats["payload_bytes"] += sum(removed) + kept
+        return raw
+
+    def filtered_reader(cx, cz, dimension):
+        return strip(reader(cx, cz, dimension))
+
+    level_wrapper._get_raw_chunk_data = filtered_reader
+    try:
+        yield strip
     finally:
         try:
-            wrapper.close()
-        except Exception:
+            del level_wrapper._get_raw_chunk_data
+        except AttributeError:
             pass
 
 
+def _strip_raw_chunk(raw, excluded: frozenset[str]) -> list[int]:
+    # Returns the uncompressed size in bytes of every payload removed.
+    if not isinstance(raw, dict) or not raw:
+        return []
+    if all(isinstance(key, bytes) for key in raw):
+        return _strip_bedrock_chunk(raw, excluded)
+    return _strip_anvil_chunk(raw, excluded)
+
+
+def _strip_bedrock_chunk(raw: dict, excluded: frozenset[str]) -> list[int]:
+    removed: list[int] = []
+    for category in excluded:
+        for key in _BEDROCK_CATEGORY_KEYS.get(category, ()):
+            value = raw.pop(key, None)
+            if value is not None:
+                removed.append(_payload_size(value))
+    if "entities" in excluded:
+        for key in [k for k in raw if k.startswith(b"actor")]:
+            removed.append(_payload_size(raw.pop(key)))
+        # Newer worlds keep entities in actor records attached to the chunk.
+        actors = getattr(raw, "entity_actor", None)
+        if actors:
+            removed.extend(_payload_size(actor) for actor in actors)
+            actors.clear()
+    return removed
+
+
+def _raw_chunk_size(raw) -> int:
+    # Uncompressed size in bytes of what is left of a raw chunk, in the same
+    # unit as the sizes _strip_raw_chunk returns.
+    if not isinstance(raw, dict):
+        return 0
+    size = sum(_payload_size(value) for value in raw.values())
+    return size + sum(_payload_size(actor) for actor in getattr(raw, "entity_actor", None) or ())
+
+
+def _payload_size(value) -> int:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    try:
+        return len(value.to_nbt(compressed=False))
+    except Exception:
+        return 0
+
+
+def _strip_anvil_chunk(raw: dict, excluded: frozenset[str]) -> list[int]:
+    removed: list[int] = []
+    for category in excluded:
+        for layer in _ANVIL_CATEGORY_LAYERS.get(category, ()):
+            value = raw.pop(layer, None)
+            if value is not None:
+                removed.append(_payload_size(value))
+
+    region = raw.get("region")
+    root = getattr(region, "tag", None)
+    if root is None:
+        return removed
+    compounds = [root]
+    if "Level" in root:
+        compounds.append(root["Level"])
+    for compound in compounds:
+        for category in excluded:
+            for key in _ANVIL_CATEGORY_TAGS.get(category, ()):
+                value = compound.pop(key, None)
+                if value is not None:
+                    removed.append(_payload_size(value))
+        sections = compound.get("sections") or compound.get("Sections") or []
+        for section in sections:
+            for category in excluded:
+                for key in _ANVIL_SECTION_CATEGORY_TAGS.get(category, ()):
+                    value = section.pop(key, None)
+                    if value is not None:
+                        removed.append(_payload_size(value))
+    return removed
+
+
 def _create_world_wrapper(
     target_platform: str,
     output_path: Path,
@@ -205,6 +757,12 @@ def convert_batch(
     target_version: Optional[str] = None,
     force_repair: bool = False,
     log: Optional[LogFn] = None,
+    content_scope: Optional[Iterable[str]] = None,
+    output_options: Optional[OutputOptions] = None,
+    verify: bool = False,
+    staging_dir: Optional[str | Path] = None,
+    io_limit: Optional[float] = None,
+    read_ahead: int = 64,
 ) -> ConversionResult:
     output_root = Path(output_root).expanduser().resolve()
     output_root.mkdir(parents=True, exist_ok=True)
@@ -223,6 +781,12 @@ def convert_batch(
             target_version=target_version,
             force_repair=force_repair,
             log=log,
+            content_scope=content_scope,
+            output_options=output_options,
+            verify=verify,
+            staging_dir=staging_dir,
+            io_limit=io_limit,
+            read_ahead=read_ahead,
         )
         if not result.success:
             failures.append(f"{input_path}: {result.message}")
@@ -234,14 +798,17 @@ def convert_batch(
     return ConversionResult(True, "批量转换完成。")
 
 
-def _log_save_progress(progress_iter, log: Optional[LogFn]) -> None:
+def _log_save_progress(progress_iter, log: Optional[LogFn]) -> int:
     last_percent = -1
+    processed = 0
     for done, total in progress_iter:
+        processed = done
         if total:
             percent = int(done / total * 100)
             if percent != last_percent:
                 last_percent = percent
                 _log(log, f"进度: {percent}% ({done}/{total})")
+    return processed
 
 
 def _get_level_platform(level) -> Optional[str]:
@@ -253,18 +820,15 @@ def _get_level_platform(level) -> Optional[str]:
     return getattr(level, "platform", None)
 
 
-def _copy_world_folder(source: Path, destination: Path) -> None:
+def _copy_world_folder(
+    source: Path, destination: Path, throttle: Optional[IOThrottle] = None
+) -> None:
     for item in source.iterdir():
         target = destination / item.name
         if item.is_dir():
-            shutil.copytree(item, target)
+            copy_tree(item, target, throttle)
         else:
-            shutil.copy2(item, target)
-
-
-def _log(log: Optional[LogFn], message: str) -> None:
-    if log is not None:
-        log(message)
+            copy_file(item, target, throttle)
 
 
 def _resolve_target_platform(direction: Direction) -> str:
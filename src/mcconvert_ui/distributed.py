@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .converter import ConversionResult, Direction, convert_world
+from .logs import LogFn, emit_log
+from .output import OutputOptions
+from .scan import detect_platform
+
+# Coordinator-free sharding over a shared filesystem.  Every worker lists the
+# input root, claims a world by creating its lease file with O_EXCL, keeps the
+# lease fresh with a heartbeat and publishes the finished world with a rename.
+# Leases that stop being refreshed are reclaimed by whichever worker notices
+# first; only one reclaimer can win the rename of the stale lease.
+STATE_DIR = ".mcconvert"
+
+
+class _Lease:
+    def __init__(self, path: Path, worker_id: str, interval: float) -> None:
+        self.path = path
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._heartbeat, name=f"lease-{path.stem}", daemon=True
+        )
+
+    def start(self) -> "_Lease":
+        self._thread.start()
+        return self
+
+    def owned(self) -> bool:
+        if self.lost:
+            return False
+        owner = _read_json(self.path).get("worker")
+        if owner != self.worker_id:
+            self.lost = True
+        return not self.lost
+
+    def release(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        if self.owned():
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.owned():
+                return
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                self.lost = True
+                return
+
+
+class ShardWorker:
+    def __init__(
+        self,
+        input_root: str | Path,
+        output_root: str | Path,
+        worker_id: Optional[str] = None,
+        lease_timeout: float = 300.0,
+        log: Optional[LogFn] = None,
+    ) -> None:
+        self.input_root = Path(input_root).expanduser().resolve()
+        self.output_root = Path(output_root).expanduser().resolve()
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.lease_timeout = lease_timeout
+        self._log_fn = log
+        self.state_dir = self.output_root / STATE_DIR
+        self.lease_dir = self.state_dir / "leases"
+        self.result_dir = self.state_dir / "results"
+        self.work_dir = self.state_dir / "work"
+        for path in (self.lease_dir, self.result_dir, self.work_dir):
+            path.mkdir(parents=True, exist_ok=True)
+
+    def pending_worlds(self) -> list[Path]:
+        worlds = [
+            path
+            for path in sorted(self.input_root.iterdir())
+            if path.is_dir() and detect_platform(path) is not None
+        ]
+        return [w for w in worlds if not self._result_path(w.name).exists()]
+
+    def claim(self, name: str) -> Optional[_Lease]:
+        if self._result_path(name).exists():
+            return None
+        lease_path = self.lease_dir / f"{name}.lease"
+        for _ in range(2):
+            try:
+                fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._reclaim_stale(lease_path):
+                    return None
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(
+                    {
+                        "worker": self.worker_id,
+                        "host": socket.gethostname(),
+                        "pid": os.getpid(),
+                        "claimed": time.time(),
+                    },
+                    handle,
+                )
+            # A dead worker may have left a finished result behind the lease.
+            if self._result_path(name).exists():
+                lease_path.unlink()
+                return None
+            return _Lease(lease_path, self.worker_id, self.lease_timeout / 3).start()
+        return None
+
+    def run(
+        self,
+        direction: Direction,
+        target_version: Optional[str] = None,
+        force_repair: bool = False,
+        content_scope: Optional[Iterable[str]] = None,
+        output_options: Optional[OutputOptions] = None,
+        verify: bool = False,
+        staging_dir: Optional[str | Path] = None,
+        io_limit: Optional[float] = None,
+        max_worlds: Optional[int] = None,
+    ) -> ConversionResult:
+        processed: list[str] = []
+        failures: list[str] = []
+        while max_worlds is None or len(processed) < max_worlds:
+            claimed = None
+            # A world whose result could not be written is not retried here.
+            pending = [w for w in self.pending_worlds() if w.name not in processed]
+            for world in pending:
+                lease = self.claim(world.name)
+                if lease is not None:
+                    claimed = (world, lease)
+                    break
+            if claimed is None:
+                if not [w for w in self.pending_worlds() if w.name not in processed]:
+                    break
+                # Every unfinished world is leased to another worker; keep
+                # polling so a dead worker's lease is reclaimed once stale.
+                time.sleep(self.lease_timeout / 3)
+                continue
+
+            world, lease = claimed
+            self._log(f"\n=== [{self.worker_id}] 领取 {world.name} ===")
+            try:
+                result = self._convert(
+                    world,
+                    lease,
+                    direction=direction,
+                    target_version=target_version,
+                    force_repair=force_repair,
+                    content_scope=content_scope,
+                    output_options=output_options,
+                    verify=verify,
+                    staging_dir=staging_dir,
+                    io_limit=io_limit,
+                )
+            except Exception:
+                # A rename race or a shared-filesystem error fails this world
+                # only; the worker moves on to the next one.
+                result = ConversionResult(False, "转换任务异常中止。", traceback.format_exc())
+                self._log(f"{world.name}: {result.message}\n{result.details}")
+                shutil.rmtree(self.work_dir / self.worker_id / world.name, ignore_errors=True)
+                try:
+                    self._write_result(world.name, result)
+                except OSError as exc:
+                    self._log(f"{world.name}: 无法写入结果: {exc}")
+            finally:
+                lease.release()
+            processed.append(world.name)
+            if not result.success:
+                failures.append(f"{world}: {result.message}")
+
+        message = f"[{self.worker_id}] 已处理 {len(processed)} 个存档。"
+        if failures:
+            return ConversionResult(False, message, "\n".join(failures))
+        return ConversionResult(True, message)
+
+    def _convert(self, world: Path, lease: _Lease, **options) -> ConversionResult:
+        name = world.name
+        self._discard_stale_work(name)
+        staging = self.work_dir / self.worker_id / name
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        result = convert_world(
+            input_path=world, output_path=staging, log=self._log_fn, **options
+        )
+
+        if not lease.owned():
+            shutil.rmtree(staging, ignore_errors=True)
+            return ConversionResult(False, "租约已被其他节点回收，放弃本次结果。")
+
+        final = self.output_root / name
+        if result.success:
+            if final.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+                result = ConversionResult(False, "输出路径已存在，未覆盖。")
+            else:
+                os.rename(staging, final)
+        else:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self._write_result(name, result)
+        return result
+
+    def _reclaim_stale(self, lease_path: Path) -> bool:
+        try:
+            age = self._fs_now() - lease_path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        if age < self.lease_timeout:
+            return False
+
+        tombstone = lease_path.with_name(f"{lease_path.name}.stale.{self.worker_id}")
+        try:
+            os.rename(lease_path, tombstone)
+        except FileNotFoundError:
+            # Another worker reclaimed it first.
+            return False
+        try:
+            age = self._fs_now() - tombstone.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if age < self.lease_timeout:
+            # Lost a race with a worker that re-claimed it in the meantime:
+            # put its fresh lease back instead of stealing it.
+            try:
+                os.link(tombstone, lease_path)
+            except OSError:
+                pass
+            tombstone.unlink(missing_ok=True)
+            return False
+        owner = _read_json(tombstone).get("worker", "?")
+        tombstone.unlink(missing_ok=True)
+        self._log(f"回收失效租约: {lease_path.stem} (原节点 {owner})")
+        return True
+
+    def _discard_stale_work(self, name: str) -> None:
+        # Work directories are laid out as work/<worker>/<world>.  Only call
+        # this while holding the lease for name: any other worker's copy of
+        # that world then belongs to a lease that has been reclaimed.
+        for worker_dir in self.work_dir.iterdir():
+            stale = worker_dir / name
+            if worker_dir.is_dir() and stale.exists():
+                shutil.rmtree(stale, ignore_errors=True)
+
+    def _write_result(self, name: str, result: ConversionResult) -> None:
+        payload = {
+            "world": name,
+            "worker": self.worker_id,
+            "success": result.success,
+            "message": result.message,
+            "details": result.details,
+            "finished": time.time(),
+        }
+        target = self._result_path(name)
+        temp = target.with_name(f".{target.name}.{self.worker_id}.tmp")
+        temp.write_text(json.dumps(payload, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(temp, target)
+
+    def _result_path(self, name: str) -> Path:
+        return self.result_dir / f"{name}.json"
+
+    def _fs_now(self) -> float:
+        # Lease ages are measured against the shared filesystem's clock, not
+        # the local one, so hosts with skewed clocks agree on staleness.
+        probe = self.state_dir / f".clock.{self.worker_id}"
+        probe.touch()
+        now = probe.stat().st_mtime
+        probe.unlink()
+        return now
+
+    def _log(self, message: str) -> None:
+        emit_log(self._log_fn, message)
+
+
+def collect_results(output_root: str | Path) -> dict[str, dict]:
+    result_dir = Path(output_root).expanduser().resolve() / STATE_DIR / "results"
+    if not result_dir.is_dir():
+        return {}
+    return {path.stem: _read_json(path) for path in sorted(result_dir.glob("*.json"))}
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m mcconvert_ui.distributed",
+        description="Convert worlds from a shared input directory; run one per process or host.",
+    )
+    parser.add_argument("input_root")
+    parser.add_argument("output_root")
+    parser.add_argument(
+        "--direction",
+        required=True,
+        choices=["bedrock-to-java", "java-to-bedrock", "java-to-java", "bedrock-to-bedrock"],
+    )
+    parser.add_argument("--target-version", default=None)
+    parser.add_argument("--force-repair", action="store_true")
+    parser.add_argument("--terrain-only", action="store_true")
+    parser.add_argument("--verify", action="store_true")
+    parser.add_argument("--staging-dir", default=None, help="fast local scratch directory")
+    parser.add_argument("--io-limit", type=float, default=None, help="MiB/s written to the share")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--lease-timeout", type=float, default=300.0)
+    parser.add_argument("--max-worlds", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from .converter import TERRAIN_SCOPE
+
+    worker = ShardWorker(
+        args.input_root,
+        args.output_root,
+        worker_id=args.worker_id,
+        lease_timeout=args.lease_timeout,
+        log=print,
+    )
+    result = worker.run(
+        direction=args.direction,
+        target_version=args.target_version,
+        force_repair=args.force_repair,
+        content_scope=TERRAIN_SCOPE if args.terrain_only else None,
+        verify=args.verify,
+        staging_dir=args.staging_dir,
+        io_limit=args.io_limit * 1024 * 1024 if args.io_limit else None,
+        max_worlds=args.max_worlds,
+    )
+    print(result.message)
+    if result.details:
+        print(result.details)
+    raise SystemExit(0 if result.success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .scan import (
+    BEDROCK_VERSION_TAGS,
+    REGION_HEADER_SIZE,
+    detect_platform,
+    java_dimension_dirs,
+    open_leveldb,
+    parse_bedrock_chunk_key,
+    parse_region_header,
+    region_coords,
+    region_files,
+)
+
+DEFAULT_INDEX_DIR = Path.home() / ".mcconvert" / "index"
+JAVA_LAYERS = ("region", "entities")
+_SCHEMA_VERSION = "1"
+_LEVELDB_VOLATILE = frozenset({"LOCK", "LOG", "LOG.old"})
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    dimension TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    cx INTEGER NOT NULL,
+    cz INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    offset INTEGER,
+    size INTEGER NOT NULL,
+    timestamp INTEGER,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (dimension, layer, cx, cz)
+);
+CREATE INDEX IF NOT EXISTS chunks_by_file ON chunks (file);
+CREATE INDEX IF NOT EXISTS chunks_by_timestamp ON chunks (timestamp);
+"""
+
+
+@dataclass(frozen=True)
+class ChunkRecord:
+    dimension: str
+    layer: str
+    cx: int
+    cz: int
+    file: str
+    offset: Optional[int]
+    size: int
+    timestamp: Optional[int]
+    hash: str
+
+
+def default_index_path(world: Path) -> Path:
+    digest = hashlib.sha1(str(world).encode("utf-8")).hexdigest()[:16]
+    return DEFAULT_INDEX_DIR / f"{world.name}-{digest}.sqlite"
+
+
+class WorldIndex:
+    # Chunk inventory of one source world kept in SQLite.  update() only
+    # rescans region files whose size or mtime changed; for Bedrock the
+    # LevelDB is rescanned as a whole when any of its files changed.
+
+    def __init__(self, world: str | Path, index_path: Optional[str | Path] = None) -> None:
+        self.world = Path(world).expanduser().resolve()
+        self.platform = detect_platform(self.world)
+        if self.platform is None:
+            raise ValueError(f"无法识别的存档格式: {self.world}")
+        self.index_path = Path(index_path) if index_path else default_index_path(self.world)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.index_path))
+        self._db.executescript(_SCHEMA)
+        self._check_schema()
+
+    def __enter__(self) -> "WorldIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def update(self, max_workers: int = 4) -> dict:
+        started = time.perf_counter()
+        if self.platform == "java":
+            stats = self._update_java(max_workers)
+        else:
+            stats = self._update_bedrock()
+        self._set_meta("updated", str(time.time()))
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    def dimensions(self, layer: str = "region") -> dict[str, int]:
+        rows = self._db.execute(
+            "SELECT dimension, COUNT(*) FROM chunks WHERE layer = ? GROUP BY dimension",
+            (self._layer(layer),),
+        )
+        return dict(rows.fetchall())
+
+    def chunk_count(self, dimension: Optional[str] = None, layer: str = "region") -> int:
+        sql, params = self._filter(dimension, layer)
+        return self._db.execute(f"SELECT COUNT(*) FROM chunks {sql}", params).fetchone()[0]
+
+    def total_size(self, dimension: Optional[str] = None, layer: str = "region") -> int:
+        sql, params = self._filter(dimension, layer)
+        row = self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM chunks {sql}", params)
+        return row.fetchone()[0]
+
+    def chunks(self, dimension: Optional[str] = None, layer: str = "region") -> list[ChunkRecord]:
+        sql, params = self._filter(dimension, layer)
+        rows = self._db.execute(
+            f"SELECT dimension, layer, cx, cz, file, offset, size, timestamp, hash "
+            f"FROM chunks {sql} ORDER BY dimension, file, offset, cx, cz",
+            params,
+        )
+        return [ChunkRecord(*row) for row in rows]
+
+    def changed_since(self, timestamp: int, dimension: Optional[str] = None) -> list[ChunkRecord]:
+        # Java: region header save times.  Bedrock: time of the update() that
+        # first indexed the chunk's current content.
+        sql, params = self._filter(dimension, "region")
+        rows = self._db.execute(
+            f"SELECT dimension, layer, cx, cz, file, offset, size, timestamp, hash "
+            f"FROM chunks {sql} AND timestamp >= ? ORDER BY timestamp, dimension, cx, cz",
+            (*params, timestamp),
+        )
+        return [ChunkRecord(*row) for row in rows]
+
+    def hashes(self, layer: str = "region") -> dict[tuple[str, int, int], str]:
+        rows = self._db.execute(
+            "SELECT dimension, cx, cz, hash FROM chunks WHERE layer = ?", (self._layer(layer),)
+        )
+        return {(d, cx, cz): h for d, cx, cz, h in rows}
+
+    def diff(self, previous: dict[tuple[str, int, int], str]) -> dict[str, list]:
+        current = self.hashes()
+        return {
+            "added": sorted(current.keys() - previous.keys()),
+            "removed": sorted(previous.keys() - current.keys()),
+            "changed": sorted(k for k in current.keys() & previous.keys() if current[k] != previous[k]),
+        }
+
+    def _update_java(self, max_workers: int) -> dict:
+        known = {
+            path: (size, mtime)
+            for path, size, mtime in self._db.execute("SELECT path, size, mtime_ns FROM files")
+        }
+        current: dict[str, tuple[str, str, Path, tuple[int, int]]] = {}
+        for dimension, directory in java_dimension_dirs(self.world).items():
+            for layer in JAVA_LAYERS:
+                for path in region_files(directory, layer):
+                    stat = path.stat()
+                    relative = path.relative_to(self.world).as_posix()
+                    current[relative] = (dimension, layer, path, (stat.st_size, stat.st_mtime_ns))
+
+        changed = [key for key, value in current.items() if known.get(key) != value[3]]
+        removed = [key for key in known if key not in current]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scanned = executor.map(
+                lambda key: (key, _index_region_file(current[key][2])), changed
+            )
+            with self._db:
+                for key in removed:
+                    self._db.execute("DELETE FROM chunks WHERE file = ?", (key,))
+                    self._db.execute("DELETE FROM files WHERE path = ?", (key,))
+                for key, entries in scanned:
+                    dimension, layer, _, (size, mtime) = current[key]
+                    self._db.execute("DELETE FROM chunks WHERE file = ?", (key,))
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(dimension, layer, *entry[:2], key, *entry[2:]) for entry in entries],
+                    )
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (key, size, mtime)
+                    )
+        return {"files": len(current), "rescanned": len(changed), "removed": len(removed)}
+
+    def _update_bedrock(self) -> dict:
+        db_dir = self.world / "db"
+        signature = _leveldb_signature(db_dir)
+        encoded = repr(signature)
+        if self._get_meta("leveldb_signature") == encoded:
+            return {"files": len(signature), "rescanned": 0, "removed": 0}
+
+        sizes: dict[tuple[str, int, int], int] = {}
+        digests: dict[tuple[str, int, int], object] = {}
+        versioned: set[tuple[str, int, int]] = set()
+        # Opening a LevelDB writes to its folder, so the scan runs on a
+        # snapshot and the source world (and its signature) stay untouched.
+        # It is made inside the world so the table files can be hard-linked;
+        # a read-only world falls back to a full copy next to the index.
+        try:
+            snapshot_dir = tempfile.TemporaryDirectory(dir=self.world, prefix=".mcconvert-snapshot-")
+        except OSError:
+            snapshot_dir = tempfile.TemporaryDirectory(dir=self.index_path.parent)
+        with snapshot_dir as temp:
+            snapshot = Path(temp) / "db"
+            _snapshot_leveldb(db_dir, snapshot)
+            level_db = open_leveldb(snapshot)
+            try:
+                # One ordered pass over the whole database; values are hashed
+                # in key order so the digest is stable between runs.
+                for key, value in level_db.iterate():
+                    parsed = parse_bedrock_chunk_key(key)
+                    if parsed is None:
+                        continue
+                    chunk = parsed[:3]
+                    if parsed[3] in BEDROCK_VERSION_TAGS:
+                        versioned.add(chunk)
+                    sizes[chunk] = sizes.get(chunk, 0) + len(key) + len(value)
+                    digest = digests.get(chunk)
+                    if digest is None:
+                        digest = digests[chunk] = hashlib.blake2b(digest_size=8)
+                    digest.update(key)
+                    digest.update(value)
+            finally:
+                level_db.close()
+
+        # LevelDB keeps no per-chunk save time, so a chunk's timestamp is the
+        # update that first saw its current content.
+        now = int(time.time())
+        previous = {
+            (d, cx, cz): (h, t)
+            for d, cx, cz, h, t in self._db.execute(
+                "SELECT dimension, cx, cz, hash, timestamp FROM chunks WHERE layer = 'region'"
+            )
+        }
+        rows = []
+        # Level-wide records such as "Overworld" or "scoreboard" also have
+        # chunk-key lengths; only keys of chunks with a version record count.
+        for chunk in versioned:
+            digest = digests[chunk].hexdigest()
+            known_hash, known_time = previous.get(chunk, (None, None))
+            timestamp = known_time if known_hash == digest and known_time is not None else now
+            rows.append((*chunk, sizes[chunk], timestamp, digest))
+        with self._db:
+            self._db.execute("DELETE FROM chunks")
+            self._db.executemany(
+                "INSERT INTO chunks VALUES (?, 'region', ?, ?, 'db', NULL, ?, ?, ?)", rows
+            )
+            self._set_meta("leveldb_signature", encoded, commit=False)
+        return {"files": len(signature), "rescanned": len(signature), "removed": 0}
+
+    def _filter(self, dimension: Optional[str], layer: str) -> tuple[str, tuple]:
+        if dimension is None:
+            return "WHERE layer = ?", (self._layer(layer),)
+        return "WHERE layer = ? AND dimension = ?", (self._layer(layer), dimension)
+
+    def _layer(self, layer: str) -> str:
+        return layer if self.platform == "java" else "region"
+
+    def _check_schema(self) -> None:
+        version = self._get_meta("schema")
+        if version != _SCHEMA_VERSION:
+            with self._db:
+                self._db.execute("DELETE FROM chunks")
+                self._db.execute("DELETE FROM files")
+                self._db.execute("DELETE FROM meta")
+            self._set_meta("schema", _SCHEMA_VERSION)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str, commit: bool = True) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+        if commit:
+            self._db.commit()
+
+
+def build_index(
+    worlds: Iterable[str | Path], max_workers: int = 4
+) -> dict[Path, dict]:
+    results: dict[Path, dict] = {}
+    for world in worlds:
+        with WorldIndex(world) as index:
+            results[index.world] = index.update(max_workers)
+    return results
+
+
+def _leveldb_signature(db_dir: Path) -> list[tuple[str, int, int]]:
+    # LOG and LOCK change whenever anything opens the database, even read-only.
+    return sorted(
+        (p.name, p.stat().st_size, p.stat().st_mtime_ns)
+        for p in db_dir.iterdir()
+        if p.is_file() and p.name not in _LEVELDB_VOLATILE
+    )
+
+
+def _snapshot_leveldb(db_dir: Path, target: Path) -> None:
+    # Table files are immutable once written, so they are hard-linked; the
+    # manifest, CURRENT and write-ahead logs are copied.
+    target.mkdir()
+    for path in db_dir.iterdir():
+        if not path.is_file() or path.name in _LEVELDB_VOLATILE:
+            continue
+        if path.suffix in (".ldb", ".sst"):
+            try:
+                os.link(path, target / path.name)
+                continue
+            except OSError:
+                pass
+        shutil.copy2(path, target / path.name)
+
+
+def _index_region_file(path: Path) -> list[tuple]:
+    # Returns (cx, cz, offset, size, timestamp, hash) for every chunk present.
+    coords = region_coords(path)
+    if coords is None:
+        return []
+    entries = []
+    with path.open("rb") as handle:
+        header = handle.read(REGION_HEADER_SIZE)
+        for entry in sorted(parse_region_header(header, *coords), key=lambda e: e.offset):
+            handle.seek(entry.offset)
+            data = handle.read(entry.size)
+            if len(data) < 5:
+                continue
+            length = struct.unpack_from(">I", data)[0]
+            payload = data[4 : 4 + length]
+            digest = hashlib.blake2b(payload, digest_size=8).hexdigest()
+            entries.append((entry.cx, entry.cz, entry.offset, length, entry.timestamp, digest))
+    return entries
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m mcconvert_ui.index",
+        description="Build or refresh the chunk index of one or more worlds.",
+    )
+    parser.add_argument("worlds", nargs="+")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    for world in args.worlds:
+        with WorldIndex(world) as index:
+            stats = index.update(args.workers)
+            print(
+                f"{index.world}: 重新扫描 {stats['rescanned']}/{stats['files']} 个文件, "
+                f"{stats['elapsed'] * 1000:.0f} ms"
+            )
+            for dimension, count in sorted(index.dimensions().items()):
+                print(f"  {dimension}: {count} 区块")
+
+
+if __name__ == "__main__":
+    main()
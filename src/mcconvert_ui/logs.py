@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+LogFn = Callable[[str], None]
+
+
+def emit_log(log: Optional[LogFn], message: str) -> None:
+    if log is not None:
+        log(message)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import gzip
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from .logs import LogFn, emit_log as _log
+
+REGION_COMPRESSIONS = ("zlib", "gzip", "none")
+
+# Compression type byte stored in front of every Anvil chunk payload.
+_REGION_COMPRESSION_IDS = {"gzip": 1, "zlib": 2, "none": 3}
+
+
+@dataclass
+class OutputOptions:
+    # Anvil: "zlib" (game default), "gzip" or "none" (needs Java 1.15.1+).
+    region_compression: str = "zlib"
+    # Anvil: 0-9, None keeps the library default.
+    compression_level: Optional[int] = None
+    # Bedrock: number of chunks grouped into one LevelDB write batch.
+    leveldb_batch_size: int = 1
+    # Bedrock: compact the LevelDB once all chunks are written.
+    compact_leveldb: bool = False
+
+    def validate(self) -> None:
+        if self.region_compression not in REGION_COMPRESSIONS:
+            raise ValueError(f"不支持的区域压缩算法: {self.region_compression}")
+        if self.compression_level is not None and not 0 <= self.compression_level <= 9:
+            raise ValueError(f"压缩级别必须在 0-9 之间: {self.compression_level}")
+        if self.leveldb_batch_size < 1:
+            raise ValueError(f"LevelDB 写入批大小必须大于 0: {self.leveldb_batch_size}")
+
+    def describe(self) -> str:
+        level = "默认" if self.compression_level is None else self.compression_level
+        return (
+            f"区域压缩 {self.region_compression}/{level}, "
+            f"LevelDB 批大小 {self.leveldb_batch_size}, "
+            f"压缩整理 {'开' if self.compact_leveldb else '关'}"
+        )
+
+
+def compress_region_chunk(payload: bytes, algorithm: str, level: Optional[int]) -> bytes:
+    if algorithm == "zlib":
+        data = zlib.compress(payload, -1 if level is None else level)
+    elif algorithm == "gzip":
+        data = gzip.compress(payload, compresslevel=9 if level is None else level, mtime=0)
+    elif algorithm == "none":
+        data = payload
+    else:
+        raise ValueError(f"不支持的区域压缩算法: {algorithm}")
+    return bytes((_REGION_COMPRESSION_IDS[algorithm],)) + data
+
+
+# amulet compresses region chunks through a class-level hook.  The replacement
+# is installed once and reads its settings from a thread local, so concurrent
+# conversions on other threads keep their own (or the default) behaviour.
+_anvil_settings = threading.local()
+_anvil_hook_lock = threading.Lock()
+_anvil_hook_installed = False
+
+
+def _install_anvil_hook() -> bool:
+    global _anvil_hook_installed
+    with _anvil_hook_lock:
+        if _anvil_hook_installed:
+            return True
+        try:
+            from amulet.level.formats.anvil_world.region import AnvilRegion
+        except Exception:
+            return False
+        original = AnvilRegion.__dict__.get("_compress")
+        if original is None:
+            return False
+
+        if isinstance(original, staticmethod):
+            original_fn = original.__func__
+
+            def _compress(data):
+                settings = getattr(_anvil_settings, "value", None)
+                if settings is None:
+                    return original_fn(data)
+                return compress_region_chunk(data.save_to(compressed=False), *settings)
+
+            AnvilRegion._compress = staticmethod(_compress)
+        else:
+
+            def _compress(self, data):
+                settings = getattr(_anvil_settings, "value", None)
+                if settings is None:
+                    return original(self, data)
+                return compress_region_chunk(data.save_to(compressed=False), *settings)
+
+            AnvilRegion._compress = _compress
+        _anvil_hook_installed = True
+        return True
+
+
+@contextmanager
+def anvil_compression(options: Optional[OutputOptions], log: Optional[LogFn] = None):
+    if options is None or (
+        options.region_compression == "zlib" and options.compression_level is None
+    ):
+        yield
+        return
+    if not _install_anvil_hook():
+        _log(log, "当前 Amulet 版本不支持自定义区域压缩，使用默认设置。")
+        yield
+        return
+
+    previous = getattr(_anvil_settings, "value", None)
+    _anvil_settings.value = (options.region_compression, options.compression_level)
+    try:
+        yield
+    finally:
+        _anvil_settings.value = previous
+
+
+class BatchedLevelDB:
+    # Groups per-chunk putBatch calls into larger LevelDB write batches.  Any
+    # other access flushes first, so reads always observe pending writes.
+
+    def __init__(self, db, batch_size: int) -> None:
+        self._db = db
+        self._batch_size = batch_size
+        self._pending: dict[bytes, bytes] = {}
+        self._batched = 0
+
+    def putBatch(self, data: dict) -> None:
+        self._pending.update(data)
+        self._batched += 1
+        if self._batched >= self._batch_size:
+            self.flush()
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._pending[key] = value
+
+    def flush(self) -> None:
+        if self._pending:
+            self._db.putBatch(self._pending)
+            self._pending = {}
+        self._batched = 0
+
+    def __contains__(self, key) -> bool:
+        self.flush()
+        return key in self._db
+
+    def __iter__(self):
+        self.flush()
+        return iter(self._db)
+
+    def __getattr__(self, name: str):
+        self.flush()
+        return getattr(self._db, name)
+
+
+@contextmanager
+def tuned_leveldb(wrapper, options: Optional[OutputOptions], log: Optional[LogFn] = None):
+    if options is None or (options.leveldb_batch_size == 1 and not options.compact_leveldb):
+        yield
+        return
+    db = getattr(wrapper, "_db", None)
+    if db is None or not hasattr(db, "putBatch"):
+        _log(log, "目标存档没有可调整的 LevelDB，LevelDB 写入设置未生效。")
+        yield
+        return
+
+    proxy = None
+    if options.leveldb_batch_size > 1:
+        proxy = BatchedLevelDB(db, options.leveldb_batch_size)
+        wrapper._db = proxy
+    try:
+        yield
+    finally:
+        if proxy is not None:
+            proxy.flush()
+            wrapper._db = db
+
+    if options.compact_leveldb:
+        compact = getattr(db, "compact", None)
+        if compact is None:
+            _log(log, "当前 LevelDB 不支持压缩整理，已跳过。")
+        else:
+            _log(log, "正在压缩整理 LevelDB...")
+            compact()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .logs import LogFn, emit_log
+from .staging import IOThrottle, copy_file, copy_tree
+
+
+@dataclass(frozen=True)
+class PassthroughAsset:
+    pattern: str
+    targets: frozenset[str]
+    category: Optional[str] = None
+
+
+def _asset(pattern: str, *targets: str, category: Optional[str] = None) -> PassthroughAsset:
+    return PassthroughAsset(pattern, frozenset(targets), category)
+
+
+# Files that sit next to the chunk data and need no block translation.  Each
+# entry lists the target platforms that can use it; level.dat, region files and
+# the LevelDB are always written by amulet and never appear here.
+PASSTHROUGH_MANIFEST: dict[str, tuple[PassthroughAsset, ...]] = {
+    "java": (
+        _asset("icon.png", "java"),
+        _asset("screenshots", "java", "bedrock"),
+        _asset("datapacks", "java"),
+        _asset("resources.zip", "java"),
+        _asset("stats", "java", category="players"),
+        _asset("advancements", "java", category="players"),
+        _asset("playerdata", "java", category="players"),
+        _asset("data/map_*.dat", "java", category="maps"),
+        _asset("data/idcounts.dat", "java", category="maps"),
+    ),
+    "bedrock": (
+        _asset("world_icon.jpeg", "bedrock"),
+        _asset("screenshots", "java", "bedrock"),
+        _asset("resource_packs", "bedrock"),
+        _asset("behavior_packs", "bedrock"),
+        _asset("world_resource_packs.json", "bedrock"),
+        _asset("world_behavior_packs.json", "bedrock"),
+    ),
+}
+
+# Bedrock keeps players and maps inside the LevelDB rather than as files.
+BEDROCK_RECORD_PREFIXES: dict[str, tuple[bytes, ...]] = {
+    "players": (b"~local_player", b"player_"),
+    "maps": (b"map_",),
+}
+
+
+class AssetPassthrough:
+    def __init__(
+        self,
+        source: Path,
+        destination: Path,
+        source_platform: Optional[str],
+        target_platform: str,
+        scope: frozenset[str],
+        log: Optional[LogFn] = None,
+        max_workers: int = 4,
+        throttle: Optional[IOThrottle] = None,
+    ) -> None:
+        self.source = source
+        self.destination = destination
+        self.source_platform = source_platform
+        self.target_platform = target_platform
+        self.scope = scope
+        self._log_fn = log
+        self._max_workers = max_workers
+        self._throttle = throttle
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: dict[str, Future] = {}
+        self.skipped: list[str] = []
+
+    def start(self) -> "AssetPassthrough":
+        items = self._collect()
+        if not items:
+            return self
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(items)),
+            thread_name_prefix="mcconvert-assets",
+        )
+        for relative in items:
+            self._futures[relative] = self._executor.submit(self._copy, relative)
+        return self
+
+    def wait(self) -> dict:
+        copied: list[str] = []
+        failed: list[str] = []
+        for relative, future in self._futures.items():
+            try:
+                future.result()
+                copied.append(relative)
+            except Exception as exc:
+                failed.append(relative)
+                self._log(f"资源复制失败: {relative}: {exc}")
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if copied:
+            self._log(f"已携带 {len(copied)} 项非区块资源: {', '.join(copied)}")
+        if self.skipped:
+            self._log(f"目标平台无法使用，未携带: {', '.join(self.skipped)}")
+        return {"copied": copied, "skipped": list(self.skipped), "failed": failed}
+
+    def copy_bedrock_records(self, source_db, target_db) -> list[str]:
+        if self.source_platform != "bedrock" or self.target_platform != "bedrock":
+            return []
+        if source_db is None or target_db is None:
+            return []
+        copied: list[str] = []
+        for category, prefixes in BEDROCK_RECORD_PREFIXES.items():
+            if category not in self.scope:
+                continue
+            count = 0
+            for prefix in prefixes:
+                try:
+                    for key, value in source_db.iterate(prefix, prefix + b"\xff"):
+                        target_db.put(key, value)
+                        count += 1
+                except Exception:
+                    self._log(f"复制数据库记录失败: {prefix!r}\n{traceback.format_exc()}")
+            if count:
+                copied.append(f"{category} ({count})")
+        if copied:
+            self._log(f"已携带数据库记录: {', '.join(copied)}")
+        return copied
+
+    def _collect(self) -> list[str]:
+        manifest = PASSTHROUGH_MANIFEST.get(self.source_platform or "", ())
+        items: list[str] = []
+        for asset in manifest:
+            if asset.category is not None and asset.category not in self.scope:
+                continue
+            for path in sorted(self.source.glob(asset.pattern)):
+                relative = path.relative_to(self.source).as_posix()
+                if self.target_platform in asset.targets:
+                    items.append(relative)
+                else:
+                    self.skipped.append(relative)
+        return items
+
+    def _copy(self, relative: str) -> None:
+        source = self.source / relative
+        target = self.destination / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if source.is_dir():
+            copy_tree(source, target, self._throttle)
+        else:
+            copy_file(source, target, self._throttle)
+
+    def _log(self, message: str) -> None:
+        emit_log(self._log_fn, message)
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import gzip
+import importlib
+import mmap
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from .scan import (
+    REGION_HEADER_SIZE,
+    RegionEntry,
+    bedrock_chunk_prefix,
+    iter_bedrock_chunks,
+    parse_bedrock_chunk_key,
+    parse_region_header,
+    region_coords,
+    region_files,
+)
+
+ChunkKey = tuple[int, int]
+
+# Consecutive Bedrock chunks read by one LevelDB range scan.
+BEDROCK_BATCH_SIZE = 16
+
+
+@dataclass
+class ChunkStream:
+    # The chunks of one dimension in read order.  fetch reads a batch of
+    # consecutive keys on a worker thread and returns the raw chunk data it
+    # found by key.  Without fetch nothing is read ahead and amulet reads each
+    # chunk itself on the converting thread.
+    dimension: str
+    coords: list[ChunkKey]
+    fetch: Optional[Callable[[list[ChunkKey]], dict[ChunkKey, object]]] = None
+    close: Optional[Callable[[], None]] = None
+    batch_size: int = 1
+
+    def prefetch(self, workers: int, depth: int) -> Iterator[tuple[ChunkKey, object]]:
+        # Yields (key, raw) in stream order; raw is None for chunks that were
+        # not prefetched.  depth is counted in chunks.
+        if self.fetch is None:
+            for key in self.coords:
+                yield key, None
+            return
+        size = max(1, self.batch_size)
+        batches = [self.coords[i : i + size] for i in range(0, len(self.coords), size)]
+        for batch, found, error in ReadAhead(
+            batches, self.fetch, workers=workers, depth=max(1, depth // size)
+        ):
+            for key in batch:
+                yield key, None if error is not None else found.get(key)
+
+
+class ReadAhead:
+    # Runs fetch(item) on worker threads at most `depth` items ahead of the
+    # consumer and yields (item, result, error) strictly in input order.  The
+    # window of outstanding futures is the bounded queue between the reader
+    # and the translator.
+
+    def __init__(
+        self,
+        items: Iterable,
+        fetch: Callable,
+        workers: int = 4,
+        depth: int = 64,
+    ) -> None:
+        self.items = items
+        self.fetch = fetch
+        self.workers = max(1, workers)
+        self.depth = max(1, depth)
+
+    def __iter__(self) -> Iterator[tuple[object, object, Optional[BaseException]]]:
+        pending: deque[tuple[object, Future]] = deque()
+        source = iter(self.items)
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="mcconvert-read"
+        ) as executor:
+            try:
+                for item in source:
+                    pending.append((item, executor.submit(self.fetch, item)))
+                    if len(pending) >= self.depth:
+                        yield self._take(pending)
+                while pending:
+                    yield self._take(pending)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _take(pending: deque) -> tuple[object, object, Optional[BaseException]]:
+        item, future = pending.popleft()
+        try:
+            return item, future.result(), None
+        except Exception as exc:
+            return item, None, exc
+
+
+class PrefetchedChunks:
+    # Raw chunk data handed from the read-ahead stage to amulet's decoder.
+    # While installed, the level wrapper's raw reader serves prefetched data
+    # and falls back to a direct read for anything that was not prefetched.
+
+    def __init__(self, level_wrapper) -> None:
+        self.level_wrapper = level_wrapper
+        self.reader = level_wrapper._get_raw_chunk_data
+        self._data: dict[tuple[int, int, str], object] = {}
+        self._lock = threading.Lock()
+
+    def put(self, cx: int, cz: int, dimension: str, raw) -> None:
+        with self._lock:
+            self._data[(cx, cz, dimension)] = raw
+
+    def discard(self, cx: int, cz: int, dimension: str) -> None:
+        with self._lock:
+            self._data.pop((cx, cz, dimension), None)
+
+    @contextmanager
+    def installed(self):
+        previous = self.level_wrapper.__dict__.get("_get_raw_chunk_data")
+
+        def prefetched_reader(cx, cz, dimension):
+            with self._lock:
+                raw = self._data.pop((cx, cz, dimension), None)
+            if raw is None:
+                return self.reader(cx, cz, dimension)
+            return raw
+
+        self.level_wrapper._get_raw_chunk_data = prefetched_reader
+        try:
+            yield self
+        finally:
+            if previous is None:
+                del self.level_wrapper._get_raw_chunk_data
+            else:
+                self.level_wrapper._get_raw_chunk_data = previous
+
+
+class BedrockRangeReader:
+    # Reads batches of consecutive chunks of one dimension with a single
+    # ordered range scan over the raw LevelDB handle.  Records are grouped
+    # the way amulet's raw reader groups them: by the key suffix after the
+    # chunk prefix, in a record_factory() mapping.
+
+    def __init__(self, level_db, dimension: str, record_factory: Callable[[], dict] = dict) -> None:
+        self.level_db = level_db
+        self.dimension = dimension
+        self.record_factory = record_factory
+
+    def read(self, keys: list[ChunkKey]) -> dict[ChunkKey, dict]:
+        # keys must be in LevelDB key order, as bedrock_chunk_plan lists them.
+        wanted = set(keys)
+        start = bedrock_chunk_prefix(*keys[0], self.dimension)
+        end = bedrock_chunk_prefix(*keys[-1], self.dimension) + b"\xff\xff\xff"
+        records: dict[ChunkKey, dict] = {}
+        for key, value in self.level_db.iterate(start, end):
+            parsed = parse_bedrock_chunk_key(key)
+            if parsed is None or parsed[0] != self.dimension:
+                continue
+            chunk = parsed[1:3]
+            if chunk not in wanted:
+                continue
+            record = records.get(chunk)
+            if record is None:
+                record = records[chunk] = self.record_factory()
+            record[parsed[3]] = value
+        for (cx, cz), record in records.items():
+            if hasattr(record, "entity_actor"):
+                record.entity_actor.extend(self._actors(bedrock_chunk_prefix(cx, cz, self.dimension)))
+        return records
+
+    def _actors(self, prefix: bytes) -> list[bytes]:
+        # Newer worlds keep entities as actor records listed by a digest.
+        digest = self._get(b"digp" + prefix)
+        if digest is None:
+            return []
+        actors = []
+        for index in range(0, len(digest) // 8 * 8, 8):
+            actor = self._get(b"actorprefix" + digest[index : index + 8])
+            if actor is not None:
+                actors.append(actor)
+        return actors
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        try:
+            return self.level_db.get(key)
+        except KeyError:
+            return None
+
+
+def bedrock_chunk_plan(level_db, dimensions: Iterable[str]) -> list[ChunkStream]:
+    # One ordered pass over the LevelDB keys (no values) gives every chunk in
+    # on-disk key order, so the read-ahead stage walks the SSTables sequentially.
+    plan: dict[str, list[ChunkKey]] = {dimension: [] for dimension in dimensions}
+    for dimension, cx, cz in iter_bedrock_chunks(level_db):
+        if dimension in plan:
+            plan[dimension].append((cx, cz))
+    return [ChunkStream(dimension, coords) for dimension, coords in plan.items()]
+
+
+class AnvilRegionReader:
+    # Reads the chunks of one Java dimension straight from memory-mapped
+    # region files.  Headers are parsed in place, payloads are inflated by the
+    # calling (worker) thread; zlib releases the GIL while it does so.
+
+    def __init__(self, dimension_dir: Path, layers: Iterable[str] = ("region", "entities")) -> None:
+        self.dimension_dir = dimension_dir
+        self.layers = tuple(layers)
+        self._maps: dict[Path, Optional[mmap.mmap]] = {}
+        self._entries: dict[tuple[str, int, int], tuple[Path, RegionEntry]] = {}
+        self._lock = threading.Lock()
+        self._nbt = importlib.import_module("amulet_nbt")
+        self.coords: list[ChunkKey] = []
+        for layer in self.layers:
+            for path in region_files(dimension_dir, layer):
+                mapped = self._map(path)
+                if mapped is None:
+                    continue
+                entries = parse_region_header(mapped, *region_coords(path))
+                for entry in sorted(entries, key=lambda e: e.offset):
+                    self._entries[(layer, entry.cx, entry.cz)] = (path, entry)
+                    if layer == self.layers[0]:
+                        self.coords.append((entry.cx, entry.cz))
+
+    def read(self, key: ChunkKey) -> dict:
+        cx, cz = key
+        raw = {}
+        for layer in self.layers:
+            located = self._entries.get((layer, cx, cz))
+            if located is not None:
+                raw[layer] = self._nbt.load(self._inflate(*located), compressed=False)
+        if self.layers[0] not in raw:
+            raise KeyError(f"chunk {cx}, {cz} not found")
+        return raw
+
+    def close(self) -> None:
+        with self._lock:
+            for mapped in self._maps.values():
+                if mapped is not None:
+                    mapped.close()
+            self._maps.clear()
+
+    def _map(self, path: Path) -> Optional[mmap.mmap]:
+        with self._lock:
+            if path not in self._maps:
+                mapped = None
+                if path.stat().st_size >= REGION_HEADER_SIZE:
+                    with path.open("rb") as handle:
+                        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[path] = mapped
+            return self._maps[path]
+
+    def _inflate(self, path: Path, entry: RegionEntry) -> bytes:
+        mapped = self._maps[path]
+        length, compression = struct.unpack_from(">IB", mapped, entry.offset)
+        if compression & 0x80:
+            # Oversized chunk stored next to the region file.
+            external = path.with_name(f"c.{entry.cx}.{entry.cz}.mcc")
+            return _decompress(compression & 0x7F, external.read_bytes())
+        start = entry.offset + 5
+        # Both views are released explicitly: an exception holding on to the
+        # slice would otherwise keep the mmap from being closed.
+        with memoryview(mapped) as view, view[start : start + length - 1] as payload:
+            return _decompress(compression, payload)
+
+
+def _decompress(compression: int, payload) -> bytes:
+    if compression == 2:
+        return zlib.decompress(payload)
+    if compression == 1:
+        return gzip.decompress(payload)
+    if compression == 3:
+        return bytes(payload)
+    raise ValueError(f"unsupported region compression {compression}")
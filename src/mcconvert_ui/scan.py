@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import importlib
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+OVERWORLD = "minecraft:overworld"
+NETHER = "minecraft:the_nether"
+END = "minecraft:the_end"
+
+SECTOR_SIZE = 4096
+REGION_HEADER_SIZE = 2 * SECTOR_SIZE
+
+_REGION_NAME = re.compile(r"^r\.(-?\d+)\.(-?\d+)\.mca$")
+_JAVA_DIMENSION_DIRS = {OVERWORLD: "", NETHER: "DIM-1", END: "DIM1"}
+_BEDROCK_DIMENSIONS = {0: OVERWORLD, 1: NETHER, 2: END}
+_BEDROCK_DIMENSION_IDS = {name: dimension_id for dimension_id, name in _BEDROCK_DIMENSIONS.items()}
+# Every Bedrock chunk has exactly one version record (new and legacy tag).
+BEDROCK_VERSION_TAGS = (b",", b"v")
+
+
+@dataclass(frozen=True)
+class RegionEntry:
+    cx: int
+    cz: int
+    offset: int
+    size: int
+    timestamp: int
+
+
+def detect_platform(world: Path) -> Optional[str]:
+    if (world / "db").is_dir():
+        return "bedrock"
+    if (world / "level.dat").is_file():
+        return "java"
+    return None
+
+
+def region_coords(path: Path) -> Optional[tuple[int, int]]:
+    match = _REGION_NAME.match(path.name)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def parse_region_header(header, rx: int, rz: int) -> list[RegionEntry]:
+    # header is the first 8 KiB of a region file: 1024 big-endian location
+    # entries (3 byte sector offset, 1 byte sector count) then 1024 timestamps.
+    if len(header) < REGION_HEADER_SIZE:
+        return []
+    locations = struct.unpack_from(">1024I", header, 0)
+    timestamps = struct.unpack_from(">1024I", header, SECTOR_SIZE)
+    entries: list[RegionEntry] = []
+    for index, location in enumerate(locations):
+        if not location:
+            continue
+        sector, count = location >> 8, location & 0xFF
+        if sector < 2 or not count:
+            continue
+        entries.append(
+            RegionEntry(
+                cx=rx * 32 + (index & 31),
+                cz=rz * 32 + (index >> 5),
+                offset=sector * SECTOR_SIZE,
+                size=count * SECTOR_SIZE,
+                timestamp=timestamps[index],
+            )
+        )
+    return entries
+
+
+def read_region_header(path: Path) -> list[RegionEntry]:
+    coords = region_coords(path)
+    if coords is None:
+        return []
+    with path.open("rb") as handle:
+        header = handle.read(REGION_HEADER_SIZE)
+    return parse_region_header(header, *coords)
+
+
+def java_dimension_dirs(world: Path) -> dict[str, Path]:
+    dimensions: dict[str, Path] = {}
+    for dimension, folder in _JAVA_DIMENSION_DIRS.items():
+        path = world / folder if folder else world
+        if (path / "region").is_dir():
+            dimensions[dimension] = path
+    custom_root = world / "dimensions"
+    if custom_root.is_dir():
+        for region_dir in custom_root.glob("*/*/region"):
+            namespace, name = region_dir.parent.parent.name, region_dir.parent.name
+            dimensions.setdefault(f"{namespace}:{name}", region_dir.parent)
+    return dimensions
+
+
+def region_files(dimension_dir: Path, layer: str = "region") -> list[Path]:
+    folder = dimension_dir / layer
+    if not folder.is_dir():
+        return []
+    return sorted(p for p in folder.iterdir() if region_coords(p) is not None)
+
+
+def scan_java_chunks(world: Path, max_workers: int = 4) -> dict[str, set[tuple[int, int]]]:
+    result: dict[str, set[tuple[int, int]]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for dimension, path in java_dimension_dirs(world).items():
+            chunks: set[tuple[int, int]] = set()
+            for entries in executor.map(read_region_header, region_files(path)):
+                chunks.update((entry.cx, entry.cz) for entry in entries)
+            result[dimension] = chunks
+    return result
+
+
+def open_leveldb(path: Path, create: bool = False):
+    for module_name in ("leveldb", "amulet.libs.leveldb"):
+        try:
+            module = importlib.import_module(module_name)
+        except Exception:
+            continue
+        db_class = getattr(module, "LevelDB", None)
+        if db_class is not None:
+            return db_class(str(path), create)
+    raise RuntimeError("缺少 LevelDB 组件，无法读取基岩版数据库。")
+
+
+def iter_leveldb_keys(db) -> Iterator[bytes]:
+    keys = getattr(db, "keys", None)
+    if keys is not None:
+        yield from keys()
+    else:
+        for key, _ in db.iterate():
+            yield key
+
+
+def parse_bedrock_chunk_key(key: bytes) -> Optional[tuple[str, int, int, bytes]]:
+    # Chunk records are <x:int32><z:int32>[<dimension:int32>]<tag:byte>[<y:byte>]
+    if len(key) in (9, 10):
+        cx, cz = struct.unpack_from("<ii", key)
+        dimension_id, tag = 0, key[8:]
+    elif len(key) in (13, 14):
+        cx, cz, dimension_id = struct.unpack_from("<iii", key)
+        tag = key[12:]
+    else:
+        return None
+    dimension = _BEDROCK_DIMENSIONS.get(dimension_id)
+    if dimension is None:
+        return None
+    return dimension, cx, cz, tag
+
+
+def bedrock_chunk_prefix(cx: int, cz: int, dimension: str) -> bytes:
+    # The key prefix shared by every record of one chunk.
+    dimension_id = _BEDROCK_DIMENSION_IDS[dimension]
+    if dimension_id == 0:
+        return struct.pack("<ii", cx, cz)
+    return struct.pack("<iii", cx, cz, dimension_id)
+
+
+def iter_bedrock_chunks(db) -> Iterator[tuple[str, int, int]]:
+    # Yields every chunk once, in LevelDB key order, from the keys alone.
+    for key in iter_leveldb_keys(db):
+        parsed = parse_bedrock_chunk_key(key)
+        if parsed is not None and parsed[3] in BEDROCK_VERSION_TAGS:
+            yield parsed[:3]
+
+
+def scan_bedrock_chunks(world: Path) -> dict[str, set[tuple[int, int]]]:
+    db = open_leveldb(world / "db")
+    try:
+        result: dict[str, set[tuple[int, int]]] = {}
+        for dimension, cx, cz in iter_bedrock_chunks(db):
+            result.setdefault(dimension, set()).add((cx, cz))
+        return result
+    finally:
+        db.close()
+
+
+def scan_chunks(world: Path, max_workers: int = 4) -> dict[str, set[tuple[int, int]]]:
+    platform = detect_platform(world)
+    if platform == "java":
+        return scan_java_chunks(world, max_workers)
+    if platform == "bedrock":
+        return scan_bedrock_chunks(world)
+    raise ValueError(f"无法识别的存档格式: {world}")
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class IOThrottle:
+    # Token bucket shared by every copy that should count against one budget.
+    # A job throttle may chain to the process-wide one, so both caps apply.
+
+    def __init__(
+        self,
+        bytes_per_second: float,
+        burst: Optional[float] = None,
+        parent: Optional["IOThrottle"] = None,
+    ) -> None:
+        if bytes_per_second <= 0:
+            raise ValueError(f"I/O 带宽上限必须大于 0: {bytes_per_second}")
+        self.rate = float(bytes_per_second)
+        self.capacity = float(burst if burst is not None else max(bytes_per_second, COPY_CHUNK_SIZE))
+        self.parent = parent
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int) -> None:
+        remaining = float(amount)
+        while remaining > 0:
+            step = min(remaining, self.capacity)
+            self._take(step)
+            remaining -= step
+        if self.parent is not None:
+            self.parent.consume(amount)
+
+    def _take(self, amount: float) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_global_throttle: Optional[IOThrottle] = None
+
+
+def set_global_io_limit(bytes_per_second: Optional[float]) -> None:
+    global _global_throttle
+    _global_throttle = IOThrottle(bytes_per_second) if bytes_per_second else None
+
+
+def job_throttle(bytes_per_second: Optional[float]) -> Optional[IOThrottle]:
+    if bytes_per_second:
+        return IOThrottle(bytes_per_second, parent=_global_throttle)
+    return _global_throttle
+
+
+def copy_file(source: Path, destination: Path, throttle: Optional[IOThrottle] = None) -> None:
+    if throttle is None:
+        shutil.copy2(source, destination)
+        return
+    with open(source, "rb") as reader, open(destination, "wb") as writer:
+        while True:
+            chunk = reader.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            throttle.consume(len(chunk))
+            writer.write(chunk)
+    shutil.copystat(source, destination)
+
+
+def copy_tree(source: Path, destination: Path, throttle: Optional[IOThrottle] = None) -> None:
+    shutil.copytree(
+        source,
+        destination,
+        copy_function=lambda src, dst: copy_file(Path(src), Path(dst), throttle),
+        dirs_exist_ok=True,
+    )
+
+
+def staging_path(staging_dir: Path, output_path: Path) -> Path:
+    return staging_dir / f".{output_path.name}.staging-{uuid.uuid4().hex[:8]}"
+
+
+def publish(staged: Path, output_path: Path, throttle: Optional[IOThrottle] = None) -> None:
+    # The finished world appears at output_path in a single rename.  When the
+    # staging area is on another filesystem the world is first copied next to
+    # output_path under a hidden name, then renamed into place.
+    if output_path.exists():
+        output_path.rmdir()
+    try:
+        os.rename(staged, output_path)
+        return
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+
+    partial = output_path.parent / f".{output_path.name}.partial-{uuid.uuid4().hex[:8]}"
+    try:
+        copy_tree(staged, partial, throttle)
+        os.rename(partial, output_path)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    shutil.rmtree(staged, ignore_errors=True)
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import importlib
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .logs import LogFn, emit_log as _log
+from .scan import detect_platform, scan_chunks
+
+# level.dat fields compared between source and output, as paths per platform.
+_METADATA_FIELDS: dict[str, dict[str, tuple[tuple[str, ...], ...]]] = {
+    "LevelName": {"java": (("Data", "LevelName"),), "bedrock": (("LevelName",),)},
+    "GameType": {"java": (("Data", "GameType"),), "bedrock": (("GameType",),)},
+    "SpawnX": {"java": (("Data", "SpawnX"),), "bedrock": (("SpawnX",),)},
+    "SpawnY": {"java": (("Data", "SpawnY"),), "bedrock": (("SpawnY",),)},
+    "SpawnZ": {"java": (("Data", "SpawnZ"),), "bedrock": (("SpawnZ",),)},
+    "Seed": {
+        "java": (("Data", "WorldGenSettings", "seed"), ("Data", "RandomSeed")),
+        "bedrock": (("RandomSeed",),),
+    },
+}
+
+
+@dataclass
+class DimensionDiff:
+    source: int
+    output: int
+    missing: int
+    extra: int
+    missing_sample: list[tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass
+class PaletteDiff:
+    dimension: str
+    cx: int
+    cz: int
+    missing: list[str]
+    extra: list[str]
+
+
+@dataclass
+class VerificationReport:
+    dimensions: dict[str, DimensionDiff] = field(default_factory=dict)
+    sampled: int = 0
+    palette_diffs: list[PaletteDiff] = field(default_factory=list)
+    # level.dat fields are reported but do not fail the check: amulet writes
+    # a fresh level.dat for the target and does not carry these fields over.
+    metadata_diffs: dict[str, tuple[object, object]] = field(default_factory=dict)
+    # Dimensions the target platform cannot hold; not compared.
+    skipped_dimensions: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not (
+            self.errors
+            or self.palette_diffs
+            or any(d.missing for d in self.dimensions.values())
+        )
+
+    def summary(self) -> str:
+        lines = [f"校验{'通过' if self.ok else '发现差异'} ({self.elapsed:.1f} 秒)"]
+        for dimension, diff in sorted(self.dimensions.items()):
+            line = f"  {dimension}: 源 {diff.source} / 输出 {diff.output} 区块"
+            if diff.missing or diff.extra:
+                line += f", 缺失 {diff.missing}, 多出 {diff.extra}"
+            if diff.missing_sample:
+                line += f" 例如 {diff.missing_sample[:3]}"
+            lines.append(line)
+        if self.skipped_dimensions:
+            lines.append(f"  目标平台不支持，未比对: {', '.join(self.skipped_dimensions)}")
+        lines.append(f"  抽样区块 {self.sampled} 个, 方块调色板不一致 {len(self.palette_diffs)} 个")
+        for diff in self.palette_diffs[:5]:
+            lines.append(
+                f"    {diff.dimension} ({diff.cx}, {diff.cz}): "
+                f"缺失 {diff.missing[:3]} 多出 {diff.extra[:3]}"
+            )
+        for name, (source, output) in sorted(self.metadata_diffs.items()):
+            lines.append(f"  level.dat {name}: {source!r} -> {output!r} (仅供参考)")
+        for error in self.errors:
+            lines.append(f"  错误: {error}")
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["ok"] = self.ok
+        return data
+
+
+def verify_conversion(
+    input_path: str | Path,
+    output_path: str | Path,
+    sample_size: int = 16,
+    max_workers: int = 4,
+    log: Optional[LogFn] = None,
+    skipped_dimensions: Iterable[str] = (),
+) -> VerificationReport:
+    input_path = Path(input_path).expanduser().resolve()
+    output_path = Path(output_path).expanduser().resolve()
+    report = VerificationReport(skipped_dimensions=sorted(skipped_dimensions))
+    started = time.perf_counter()
+    _log(log, "开始校验输出存档...")
+
+    # Source and output are scanned side by side; chunk inventories only read
+    # region headers / LevelDB keys, never chunk payloads.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_scan = executor.submit(scan_chunks, input_path, max_workers)
+        output_scan = executor.submit(scan_chunks, output_path, max_workers)
+        source_meta = executor.submit(_read_metadata, input_path)
+        output_meta = executor.submit(_read_metadata, output_path)
+        try:
+            source_chunks = source_scan.result()
+            output_chunks = output_scan.result()
+        except Exception as exc:
+            report.errors.append(f"区块清单扫描失败: {exc}")
+            source_chunks, output_chunks = {}, {}
+        try:
+            report.metadata_diffs = _compare_metadata(source_meta.result(), output_meta.result())
+        except Exception as exc:
+            report.errors.append(f"读取 level.dat 失败: {exc}")
+
+    for dimension in report.skipped_dimensions:
+        source_chunks.pop(dimension, None)
+        output_chunks.pop(dimension, None)
+    for dimension in sorted(set(source_chunks) | set(output_chunks)):
+        source = source_chunks.get(dimension, set())
+        output = output_chunks.get(dimension, set())
+        missing = source - output
+        report.dimensions[dimension] = DimensionDiff(
+            source=len(source),
+            output=len(output),
+            missing=len(missing),
+            extra=len(output - source),
+            missing_sample=sorted(missing)[:10],
+        )
+
+    samples = _pick_samples(source_chunks, output_chunks, sample_size)
+    if samples:
+        try:
+            _compare_palettes(input_path, output_path, samples, report)
+        except Exception as exc:
+            report.errors.append(f"方块调色板抽样失败: {exc}")
+
+    report.elapsed = time.perf_counter() - started
+    _log(log, report.summary())
+    return report
+
+
+def _pick_samples(
+    source_chunks: dict[str, set[tuple[int, int]]],
+    output_chunks: dict[str, set[tuple[int, int]]],
+    sample_size: int,
+) -> list[tuple[str, int, int]]:
+    rng = random.Random(0)
+    samples: list[tuple[str, int, int]] = []
+    for dimension in sorted(source_chunks):
+        common = sorted(source_chunks[dimension] & output_chunks.get(dimension, set()))
+        picked = rng.sample(common, min(sample_size, len(common)))
+        samples.extend((dimension, cx, cz) for cx, cz in picked)
+    return samples
+
+
+def _compare_palettes(
+    input_path: Path,
+    output_path: Path,
+    samples: list[tuple[str, int, int]],
+    report: VerificationReport,
+) -> None:
+    # amulet is not thread-safe, so the two worlds are sampled one after the
+    # other rather than side by side.
+    source_names = _sample_block_names(input_path, samples)
+    output_names = _sample_block_names(output_path, samples)
+
+    for key in samples:
+        if key not in source_names or key not in output_names:
+            continue
+        report.sampled += 1
+        missing = sorted(source_names[key] - output_names[key])
+        extra = sorted(output_names[key] - source_names[key])
+        if missing or extra:
+            report.palette_diffs.append(PaletteDiff(*key, missing, extra))
+
+
+def _sample_block_names(
+    world: Path, samples: list[tuple[str, int, int]]
+) -> dict[tuple[str, int, int], set[str]]:
+    amulet = importlib.import_module("amulet")
+    numpy = importlib.import_module("numpy")
+    level = amulet.load_level(str(world))
+    try:
+        names: dict[tuple[str, int, int], set[str]] = {}
+        for dimension, cx, cz in samples:
+            try:
+                chunk = level.get_chunk(cx, cz, dimension)
+            except Exception:
+                continue
+            palette = chunk.block_palette
+            used: set[str] = set()
+            for cy in chunk.blocks.sub_chunks:
+                for runtime_id in numpy.unique(chunk.blocks.get_sub_chunk(cy)):
+                    block = palette[int(runtime_id)]
+                    for part in getattr(block, "block_tuple", (block,)):
+                        used.add(part.namespaced_name)
+            names[(dimension, cx, cz)] = used
+        return names
+    finally:
+        level.close()
+
+
+def _read_metadata(world: Path) -> dict[str, object]:
+    platform = detect_platform(world)
+    if platform is None:
+        return {}
+    amulet_nbt = importlib.import_module("amulet_nbt")
+    data = (world / "level.dat").read_bytes()
+    if platform == "bedrock":
+        root = amulet_nbt.load(data[8:], compressed=False, little_endian=True).compound
+    else:
+        root = amulet_nbt.load(data).compound
+
+    values: dict[str, object] = {}
+    for name, paths in _METADATA_FIELDS.items():
+        for path in paths[platform]:
+            value = _lookup(root, path)
+            if value is not None:
+                values[name] = getattr(value, "py_data", value)
+                break
+    return values
+
+
+def _lookup(tag, path: tuple[str, ...]):
+    for key in path:
+        try:
+            if key not in tag:
+                return None
+            tag = tag[key]
+        except TypeError:
+            return None
+    return tag
+
+
+def _compare_metadata(
+    source: dict[str, object], output: dict[str, object]
+) -> dict[str, tuple[object, object]]:
+    diffs: dict[str, tuple[object, object]] = {}
+    for name in _METADATA_FIELDS:
+        if name in source and source.get(name) != output.get(name):
+            diffs[name] = (source.get(name), output.get(name))
+    return diffs
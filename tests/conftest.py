@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+# The package is run from source (see main.py), so tests import it the same way.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+SECTOR = 4096
+
+
+def write_region(path: Path, chunks: dict[tuple[int, int], bytes], timestamp: int = 1) -> None:
+    # chunks maps local (x, z) in 0..31 to an uncompressed payload; each chunk
+    # is zlib-compressed into its own sector(s) after the 8 KiB header.
+    locations = [0] * 1024
+    timestamps = [0] * 1024
+    body = b""
+    sector = 2
+    for (x, z), payload in chunks.items():
+        data = zlib.compress(payload)
+        record = struct.pack(">IB", len(data) + 1, 2) + data
+        count = -(-len(record) // SECTOR)
+        record += b"\0" * (count * SECTOR - len(record))
+        locations[z * 32 + x] = (sector << 8) | count
+        timestamps[z * 32 + x] = timestamp
+        body += record
+        sector += count
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(struct.pack(">1024I", *locations) + struct.pack(">1024I", *timestamps) + body)
+
+
+@pytest.fixture
+def java_world(tmp_path: Path) -> Path:
+    world = tmp_path / "world"
+    world.mkdir()
+    (world / "level.dat").write_bytes(b"")
+    write_region(world / "region" / "r.0.0.mca", {(0, 0): b"a", (1, 0): b"b"})
+    write_region(world / "region" / "r.-1.0.mca", {(31, 2): b"c"})
+    write_region(world / "DIM-1" / "region" / "r.0.0.mca", {(3, 4): b"d"})
+    return world
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from mcconvert_ui import converter
+from mcconvert_ui.readers import ChunkStream
+from mcconvert_ui.scan import NETHER, OVERWORLD
+
+
+class Tag(dict):
+    # Stands in for an amulet_nbt compound: a dict that serializes to bytes.
+    def to_nbt(self, compressed: bool = True) -> bytes:
+        return b"".join(key.encode() + _serialize(value) for key, value in self.items())
+
+
+def _serialize(value) -> bytes:
+    if isinstance(value, list):
+        return b"".join(_serialize(item) for item in value)
+    return value.to_nbt() if hasattr(value, "to_nbt") else bytes(value)
+
+
+class NamedTag:
+    def __init__(self, tag: Tag) -> None:
+        self.tag = tag
+
+    def to_nbt(self, compressed: bool = True) -> bytes:
+        return self.tag.to_nbt(compressed)
+
+
+class BedrockChunk(dict):
+    def __init__(self, records: dict, actors: list[bytes]) -> None:
+        super().__init__(records)
+        self.entity_actor = actors
+
+
+class FakeLevelWrapper:
+    def __init__(self) -> None:
+        self.unloads = 0
+        self.main = threading.current_thread()
+
+    def _get_raw_chunk_data(self, cx, cz, dimension):
+        assert threading.current_thread() is self.main
+        if (cx, cz) == (9, 9):
+            raise KeyError("missing")
+        return f"direct {cx},{cz}"
+
+    def load_chunk(self, cx, cz, dimension):
+        return (dimension, cx, cz, self._get_raw_chunk_data(cx, cz, dimension))
+
+    def unload(self) -> None:
+        self.unloads += 1
+
+
+class FakeWrapper:
+    def __init__(self) -> None:
+        self.committed: list[tuple] = []
+        self.saves = 0
+        self.unloads = 0
+
+    def commit_chunk(self, chunk, dimension) -> None:
+        self.committed.append(chunk)
+
+    def save(self) -> None:
+        self.saves += 1
+
+    def unload(self) -> None:
+        self.unloads += 1
+
+
+def test_transfer_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(converter, "_SAVE_INTERVAL", 2)
+    closed: list[str] = []
+    level_wrapper, wrapper = FakeLevelWrapper(), FakeWrapper()
+    plan = [
+        ChunkStream(
+            OVERWORLD,
+            [(0, 0), (1, 0), (9, 9)],
+            fetch=lambda keys: {key: f"prefetched {key[0]},{key[1]}" for key in keys if key != (9, 9)},
+            close=lambda: closed.append(OVERWORLD),
+        ),
+        ChunkStream(NETHER, [(2, 0)], close=lambda: closed.append(NETHER)),
+    ]
+    stats: dict = {}
+
+    progress = list(converter._transfer_chunks(level_wrapper, wrapper, plan, 4, stats))
+
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert wrapper.committed == [
+        (OVERWORLD, 0, 0, "prefetched 0,0"),
+        (OVERWORLD, 1, 0, "prefetched 1,0"),
+        (NETHER, 2, 0, "direct 2,0"),
+    ]
+    assert stats == {"failed_chunks": 1}
+    assert closed == [OVERWORLD, NETHER]
+    assert (wrapper.saves, wrapper.unloads, level_wrapper.unloads) == (3, 3, 3)
+    assert "_get_raw_chunk_data" not in vars(level_wrapper)
+
+
+def test_normalize_content_scope() -> None:
+    assert converter._normalize_content_scope(None) == frozenset(converter.CONTENT_CATEGORIES)
+    assert converter._normalize_content_scope("biomes") == {"blocks", "biomes"}
+    assert converter._normalize_content_scope([" entities ", ""]) == {"blocks", "entities"}
+    with pytest.raises(converter.ConversionError):
+        converter._normalize_content_scope(["blocks", "weather"])
+
+
+def test_strip_bedrock_chunk() -> None:
+    raw = BedrockChunk(
+        {b"/": b"sub", b"+": b"bio", b"1": b"tile", b"2": b"ent", b"actor1": b"act"},
+        [b"actor-a", b"actor-b"],
+    )
+
+    removed = converter._strip_raw_chunk(raw, frozenset({"entities"}))
+
+    assert sorted(removed) == [3, 3, 7, 7]
+    assert raw == {b"/": b"sub", b"+": b"bio", b"1": b"tile"}
+    assert raw.entity_actor == []
+    assert converter._raw_chunk_size(raw) == 10
+
+    removed = converter._strip_raw_chunk(raw, frozenset({"biomes", "block_entities"}))
+    assert sorted(removed) == [3, 4]
+    assert raw == {b"/": b"sub"}
+
+
+def test_strip_anvil_chunk() -> None:
+    section = Tag(block_states=b"bs", biomes=b"bi")
+    level = Tag(Entities=b"e", TileEntities=b"te", Sections=[Tag(Biomes=b"x")])
+    root = Tag(sections=[section], block_entities=b"be", Biomes=b"bio", Level=level)
+    raw = {"region": NamedTag(root), "entities": NamedTag(Tag(Entities=b"mob"))}
+    total = converter._raw_chunk_size(raw)
+
+    removed = converter._strip_raw_chunk(raw, frozenset({"biomes", "entities"}))
+
+    assert set(raw) == {"region"}
+    assert "Biomes" not in root and "biomes" not in section and "Entities" not in level
+    assert root["block_entities"] == b"be" and level["TileEntities"] == b"te"
+    # Only the listed section keys are removed: legacy section biomes stay.
+    assert level["Sections"][0] == {"Biomes": b"x"}
+    assert sorted(removed) == [1, 2, 3, 11]
+    # Sizes are of the removed values; the fake also serializes their keys.
+    assert converter._raw_chunk_size(raw) == total - sum(removed) - len(b"BiomesbiomesEntities")
+
+
+def test_raw_chunk_size() -> None:
+    assert converter._raw_chunk_size(None) == 0
+    assert converter._raw_chunk_size(BedrockChunk({b"/": b"1234"}, [b"56"])) == 6
+    assert converter._raw_chunk_size({"region": NamedTag(Tag(a=b"bc"))}) == 3
+    # Values that cannot be serialized count as empty rather than failing.
+    assert converter._raw_chunk_size({"region": object()}) == 0
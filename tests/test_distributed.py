@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from mcconvert_ui import distributed
+from mcconvert_ui.converter import ConversionResult
+from mcconvert_ui.distributed import ShardWorker, collect_results
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+@pytest.fixture
+def roots(tmp_path: Path) -> tuple[Path, Path]:
+    input_root = tmp_path / "input"
+    for name in ("a", "a.b", "c"):
+        (input_root / name).mkdir(parents=True)
+        (input_root / name / "level.dat").write_bytes(b"")
+    return input_root, tmp_path / "output"
+
+
+@pytest.fixture
+def fake_convert(monkeypatch):
+    def convert_world(input_path, output_path, log=None, **options):
+        output_path.mkdir(parents=True)
+        (output_path / "level.dat").write_text(input_path.name)
+        return ConversionResult(True, "ok")
+
+    monkeypatch.setattr(distributed, "convert_world", convert_world)
+
+
+def _leave_lease(worker: ShardWorker, name: str, owner: str, age: float) -> Path:
+    # A lease as a crashed worker leaves it: present, no heartbeat.
+    lease = worker.lease_dir / f"{name}.lease"
+    lease.write_text(json.dumps({"worker": owner}))
+    stamp = time.time() - age
+    os.utime(lease, (stamp, stamp))
+    return lease
+
+
+def test_claim_is_exclusive(roots) -> None:
+    first = ShardWorker(*roots, worker_id="one")
+    second = ShardWorker(*roots, worker_id="two")
+
+    lease = first.claim("a")
+    assert lease is not None
+    assert second.claim("a") is None
+    lease.release()
+
+    lease = second.claim("a")
+    assert lease is not None and lease.owned()
+    lease.release()
+
+
+def test_reclaims_only_stale_leases(roots) -> None:
+    worker = ShardWorker(*roots, worker_id="one", lease_timeout=60)
+
+    _leave_lease(worker, "a", "dead", age=5)
+    assert worker.claim("a") is None
+
+    lease_path = _leave_lease(worker, "c", "dead", age=120)
+    lease = worker.claim("c")
+    assert lease is not None
+    assert json.loads(lease_path.read_text())["worker"] == "one"
+    assert sorted(p.name for p in worker.lease_dir.iterdir()) == ["a.lease", "c.lease"]
+    lease.release()
+
+
+def test_discard_stale_work_keeps_other_worlds(roots) -> None:
+    worker = ShardWorker(*roots, worker_id="one")
+    stale = worker.work_dir / "dead" / "a"
+    in_progress = worker.work_dir / "two" / "a.b"
+    stale.mkdir(parents=True)
+    in_progress.mkdir(parents=True)
+
+    lease = worker.claim("a")
+    worker._discard_stale_work("a")
+    lease.release()
+
+    assert not stale.exists()
+    assert in_progress.exists()
+
+
+def test_run_waits_for_dead_workers_lease(roots, fake_convert) -> None:
+    input_root, output_root = roots
+    worker = ShardWorker(input_root, output_root, worker_id="one", lease_timeout=0.6)
+    _leave_lease(worker, "a", "dead", age=0)
+
+    result = worker.run("java-to-java")
+
+    assert result.success, result.details
+    assert sorted(collect_results(output_root)) == ["a", "a.b", "c"]
+    assert (output_root / "a" / "level.dat").read_text() == "a"
+    assert (output_root / "a.b" / "level.dat").read_text() == "a.b"
+    assert list(worker.lease_dir.iterdir()) == []
+
+
+def test_run_records_unexpected_errors(roots, fake_convert, monkeypatch) -> None:
+    input_root, output_root = roots
+    worker = ShardWorker(input_root, output_root, worker_id="one")
+    real_rename = os.rename
+
+    def rename(source, target):
+        if Path(target).name == "a.b":
+            raise OSError("stale NFS file handle")
+        real_rename(source, target)
+
+    monkeypatch.setattr(distributed.os, "rename", rename)
+
+    result = worker.run("java-to-java")
+
+    assert not result.success
+    assert "a.b" in result.details
+    results = collect_results(output_root)
+    assert sorted(results) == ["a", "a.b", "c"]
+    assert not results["a.b"]["success"]
+    assert "stale NFS file handle" in results["a.b"]["details"]
+    assert results["c"]["success"]
+    assert not (worker.work_dir / "one" / "a.b").exists()
+    assert list(worker.lease_dir.iterdir()) == []
+
+
+def test_processes_claim_each_world_once(tmp_path: Path) -> None:
+    input_root = tmp_path / "input"
+    names = [f"world{i:02d}" for i in range(12)]
+    for name in names:
+        (input_root / name).mkdir(parents=True)
+        (input_root / name / "level.dat").write_bytes(b"")
+    output_root = tmp_path / "output"
+    script = (
+        "import sys\n"
+        "from mcconvert_ui.distributed import ShardWorker\n"
+        "worker = ShardWorker(sys.argv[1], sys.argv[2], worker_id=sys.argv[3])\n"
+        "for world in worker.pending_worlds():\n"
+        "    if worker.claim(world.name) is not None:\n"
+        "        print(world.name)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", script, str(input_root), str(output_root), f"p{i}"],
+            stdout=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+        for i in range(4)
+    ]
+    claimed = []
+    for process in processes:
+        out, _ = process.communicate(timeout=60)
+        assert process.returncode == 0
+        claimed.extend(out.split())
+
+    assert sorted(claimed) == names
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+
+from conftest import write_region
+from mcconvert_ui import index as index_module
+from mcconvert_ui.index import WorldIndex
+from mcconvert_ui.scan import NETHER, OVERWORLD
+
+
+def _chunk_key(cx: int, cz: int, dimension_id: int = 0) -> bytes:
+    if dimension_id:
+        return struct.pack("<iii", cx, cz, dimension_id)
+    return struct.pack("<ii", cx, cz)
+
+
+def test_index_updates_incrementally(java_world: Path, tmp_path: Path) -> None:
+    with WorldIndex(java_world, tmp_path / "index.sqlite") as index:
+        assert index.update()["rescanned"] == 3
+        assert index.dimensions() == {OVERWORLD: 3, NETHER: 1}
+        before = index.hashes()
+
+        assert index.update()["rescanned"] == 0
+
+        region = java_world / "region" / "r.0.0.mca"
+        write_region(region, {(0, 0): b"changed", (1, 0): b"b", (2, 0): b"new"}, timestamp=5)
+        os.utime(region, ns=(0, region.stat().st_mtime_ns + 10**9))
+        assert index.update()["rescanned"] == 1
+        assert index.diff(before) == {
+            "added": [(OVERWORLD, 2, 0)],
+            "removed": [],
+            "changed": [(OVERWORLD, 0, 0)],
+        }
+        assert [(r.cx, r.cz) for r in index.changed_since(5)] == [(0, 0), (1, 0), (2, 0)]
+
+        (java_world / "DIM-1" / "region" / "r.0.0.mca").unlink()
+        assert index.update()["removed"] == 1
+        assert NETHER not in index.dimensions()
+
+
+def test_index_bedrock_skips_level_records_and_source(tmp_path: Path, monkeypatch) -> None:
+    world = tmp_path / "bedrock"
+    db_dir = world / "db"
+    db_dir.mkdir(parents=True)
+    for name in ("000005.ldb", "MANIFEST-000004", "CURRENT", "LOG"):
+        (db_dir / name).write_bytes(name.encode())
+    records = {
+        b"Overworld": b"x",
+        b"mobevents": b"y",
+        _chunk_key(1, 2) + b",": b"\x28",
+        _chunk_key(1, 2) + b"/\x00": b"sub",
+        _chunk_key(3, 4, 1) + b"v": b"\x07",
+    }
+    opened: list[Path] = []
+
+    class FakeLevelDB:
+        def __init__(self, path: Path) -> None:
+            # A real LevelDB writes to its folder when opened.
+            opened.append(path)
+            (path / "LOG").write_bytes(b"opened")
+            (path / "000006.log").write_bytes(b"")
+
+        def iterate(self):
+            return iter(sorted(records.items()))
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(index_module, "open_leveldb", FakeLevelDB)
+    before = sorted(os.listdir(db_dir))
+    with WorldIndex(world, tmp_path / "index.sqlite") as index:
+        assert index.update()["rescanned"] == 3
+        assert index.dimensions() == {OVERWORLD: 1, NETHER: 1}
+        assert index.total_size(OVERWORLD) == 9 + 1 + 10 + 3
+        assert index.update()["rescanned"] == 0
+    assert sorted(os.listdir(db_dir)) == before
+    assert opened and all(db_dir not in (p, *p.parents) for p in opened)
+
+
+def test_region_payloads_are_hashed(tmp_path: Path) -> None:
+    region = tmp_path / "r.0.0.mca"
+    write_region(region, {(0, 0): b"a", (1, 0): b"a"})
+    entries = index_module._index_region_file(region)
+    assert len(entries) == 2
+    assert entries[0][5] == entries[1][5]
+    length = struct.unpack_from(">I", region.read_bytes(), entries[0][2])[0]
+    assert entries[0][3] == length
+
+
+def test_index_bedrock_snapshot_and_timestamps(tmp_path: Path, monkeypatch) -> None:
+    world = tmp_path / "bedrock"
+    db_dir = world / "db"
+    db_dir.mkdir(parents=True)
+    table = db_dir / "000005.ldb"
+    table.write_bytes(b"table")
+    records = {_chunk_key(0, 0) + b",": b"\x28", _chunk_key(1, 0) + b",": b"\x28"}
+    linked: list[bool] = []
+
+    class FakeLevelDB:
+        def __init__(self, path: Path) -> None:
+            # Snapshots sit inside the world, with the table files hard-linked.
+            assert path.parent.parent == world
+            linked.append((path / table.name).stat().st_ino == table.stat().st_ino)
+
+        def iterate(self):
+            return iter(sorted(records.items()))
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(index_module, "open_leveldb", FakeLevelDB)
+    monkeypatch.setattr(index_module.time, "time", lambda: 100.0)
+    with WorldIndex(world, tmp_path / "index" / "world.sqlite") as index:
+        index.update()
+        assert [(r.cx, r.timestamp) for r in index.changed_since(100)] == [(0, 100), (1, 100)]
+
+        records[_chunk_key(1, 0) + b"/\x00"] = b"sub"
+        records[_chunk_key(2, 0) + b","] = b"\x28"
+        table.write_bytes(b"table v2")
+        monkeypatch.setattr(index_module.time, "time", lambda: 200.0)
+        assert index.update()["rescanned"] == 1
+
+        assert [(r.cx, r.timestamp) for r in index.changed_since(150)] == [(1, 200), (2, 200)]
+        assert len(index.changed_since(0)) == 3
+    assert linked == [True, True]
+    assert os.listdir(world) == ["db"]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import pytest
+
+from mcconvert_ui.output import BatchedLevelDB, OutputOptions, compress_region_chunk, tuned_leveldb
+
+PAYLOAD = b"chunk nbt " * 100
+
+
+@pytest.mark.parametrize(
+    "algorithm, type_byte, inflate",
+    [("gzip", 1, gzip.decompress), ("zlib", 2, zlib.decompress), ("none", 3, bytes)],
+)
+@pytest.mark.parametrize("level", [None, 0, 9])
+def test_compress_region_chunk(algorithm, type_byte, inflate, level) -> None:
+    data = compress_region_chunk(PAYLOAD, algorithm, level)
+
+    assert data[0] == type_byte
+    assert inflate(data[1:]) == PAYLOAD
+
+
+def test_compress_region_chunk_rejects_unknown_algorithm() -> None:
+    with pytest.raises(ValueError):
+        compress_region_chunk(PAYLOAD, "lz4", None)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        OutputOptions(),
+        OutputOptions(region_compression="none", compression_level=0),
+        OutputOptions(region_compression="gzip", compression_level=9, leveldb_batch_size=1),
+    ],
+)
+def test_validate_accepts(options) -> None:
+    options.validate()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        OutputOptions(region_compression="lz4"),
+        OutputOptions(compression_level=-1),
+        OutputOptions(compression_level=10),
+        OutputOptions(leveldb_batch_size=0),
+    ],
+)
+def test_validate_rejects(options) -> None:
+    with pytest.raises(ValueError):
+        options.validate()
+
+
+class FakeLevelDB:
+    def __init__(self) -> None:
+        self.data: dict[bytes, bytes] = {}
+        self.batches: list[dict] = []
+        self.compacted = False
+
+    def putBatch(self, data: dict) -> None:
+        self.batches.append(dict(data))
+        self.data.update(data)
+
+    def get(self, key: bytes) -> bytes:
+        return self.data[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.data
+
+    def compact(self) -> None:
+        self.compacted = True
+
+
+def test_batched_leveldb_flushes_at_batch_size() -> None:
+    db = FakeLevelDB()
+    batched = BatchedLevelDB(db, 3)
+
+    batched.putBatch({b"a": b"1"})
+    batched.putBatch({b"b": b"2", b"c": b"3"})
+    assert db.batches == []
+    batched.putBatch({b"a": b"4"})
+
+    assert db.batches == [{b"a": b"4", b"b": b"2", b"c": b"3"}]
+    batched.putBatch({b"d": b"5"})
+    assert len(db.batches) == 1
+
+
+def test_batched_leveldb_flushes_before_reads() -> None:
+    db = FakeLevelDB()
+    batched = BatchedLevelDB(db, 10)
+
+    batched.putBatch({b"a": b"1"})
+    assert b"a" in batched
+    batched.putBatch({b"b": b"2"})
+    assert batched.get(b"b") == b"2"
+
+    assert db.batches == [{b"a": b"1"}, {b"b": b"2"}]
+
+
+def test_batched_leveldb_buffers_put() -> None:
+    db = FakeLevelDB()
+    batched = BatchedLevelDB(db, 1)
+
+    batched.put(b"a", b"1")
+    batched.put(b"b", b"2")
+    assert db.batches == []
+    batched.flush()
+
+    assert db.batches == [{b"a": b"1", b"b": b"2"}]
+    batched.flush()
+    assert len(db.batches) == 1
+
+
+class FakeWrapper:
+    def __init__(self, db) -> None:
+        self._db = db
+
+
+def test_tuned_leveldb_batches_and_compacts() -> None:
+    db = FakeLevelDB()
+    wrapper = FakeWrapper(db)
+    options = OutputOptions(leveldb_batch_size=4, compact_leveldb=True)
+
+    with tuned_leveldb(wrapper, options):
+        assert isinstance(wrapper._db, BatchedLevelDB)
+        wrapper._db.putBatch({b"a": b"1"})
+
+    assert wrapper._db is db
+    assert db.batches == [{b"a": b"1"}]
+    assert db.compacted
+
+
+def test_tuned_leveldb_logs_without_database() -> None:
+    messages: list[str] = []
+    wrapper = object()
+
+    with tuned_leveldb(wrapper, OutputOptions(leveldb_batch_size=4), messages.append):
+        pass
+    with tuned_leveldb(wrapper, OutputOptions(), messages.append):
+        pass
+
+    assert len(messages) == 1
+    assert "LevelDB" in messages[0]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from mcconvert_ui import passthrough
+from mcconvert_ui.passthrough import AssetPassthrough
+
+
+def _java_world(root: Path) -> Path:
+    world = root / "world"
+    (world / "screenshots").mkdir(parents=True)
+    (world / "screenshots" / "a.png").write_bytes(b"shot")
+    (world / "playerdata").mkdir()
+    (world / "playerdata" / "p.dat").write_bytes(b"player")
+    (world / "data").mkdir()
+    (world / "data" / "map_0.dat").write_bytes(b"map0")
+    (world / "data" / "map_1.dat").write_bytes(b"map1")
+    (world / "data" / "raids.dat").write_bytes(b"raids")
+    (world / "icon.png").write_bytes(b"icon")
+    return world
+
+
+def test_collect_filters_by_target(tmp_path: Path) -> None:
+    world = _java_world(tmp_path)
+    assets = AssetPassthrough(world, tmp_path / "out", "java", "bedrock", frozenset({"blocks"}))
+
+    assert assets._collect() == ["screenshots"]
+    # Assets of categories outside the scope are neither copied nor reported.
+    assert assets.skipped == ["icon.png"]
+
+
+def test_collect_honours_scope(tmp_path: Path) -> None:
+    world = _java_world(tmp_path)
+    scope = frozenset({"blocks", "maps"})
+    assets = AssetPassthrough(world, tmp_path / "out", "java", "java", scope)
+
+    assert assets._collect() == ["icon.png", "screenshots", "data/map_0.dat", "data/map_1.dat"]
+    assert assets.skipped == []
+
+
+def test_collect_unknown_platform(tmp_path: Path) -> None:
+    world = _java_world(tmp_path)
+    assets = AssetPassthrough(world, tmp_path / "out", None, "java", frozenset({"blocks"}))
+
+    assert assets._collect() == []
+
+
+def test_wait_reports_copied_and_failed(tmp_path: Path, monkeypatch) -> None:
+    world = _java_world(tmp_path)
+    output = tmp_path / "out"
+    real_copy_file = passthrough.copy_file
+
+    def copy_file(source: Path, target: Path, throttle=None) -> None:
+        if source.name == "map_1.dat":
+            raise OSError("disk full")
+        real_copy_file(source, target, throttle)
+
+    monkeypatch.setattr(passthrough, "copy_file", copy_file)
+    messages: list[str] = []
+    scope = frozenset({"blocks", "maps", "players"})
+    assets = AssetPassthrough(world, output, "java", "bedrock", scope, log=messages.append)
+
+    result = assets.start().wait()
+
+    assert result == {
+        "copied": ["screenshots"],
+        "skipped": ["icon.png", "playerdata", "data/map_0.dat", "data/map_1.dat"],
+        "failed": [],
+    }
+    assert (output / "screenshots" / "a.png").read_bytes() == b"shot"
+
+    assets = AssetPassthrough(world, tmp_path / "java", "java", "java", scope, log=messages.append)
+    result = assets.start().wait()
+
+    assert result["failed"] == ["data/map_1.dat"]
+    assert sorted(result["copied"]) == ["data/map_0.dat", "icon.png", "playerdata", "screenshots"]
+    assert (tmp_path / "java" / "playerdata" / "p.dat").read_bytes() == b"player"
+    assert not (tmp_path / "java" / "data" / "map_1.dat").exists()
+    assert any("map_1.dat: disk full" in message for message in messages)
+
+
+def test_wait_without_assets(tmp_path: Path) -> None:
+    assets = AssetPassthrough(tmp_path, tmp_path / "out", "java", "java", frozenset({"blocks"}))
+
+    assert assets.start().wait() == {"copied": [], "skipped": [], "failed": []}
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import random
+import struct
+import sys
+import threading
+import time
+import types
+import zlib
+from pathlib import Path
+
+import pytest
+
+from conftest import write_region
+from mcconvert_ui.readers import (
+    AnvilRegionReader,
+    BedrockRangeReader,
+    ChunkStream,
+    PrefetchedChunks,
+    ReadAhead,
+    bedrock_chunk_plan,
+)
+from mcconvert_ui.scan import NETHER, OVERWORLD, bedrock_chunk_prefix
+
+
+@pytest.fixture
+def nbt(monkeypatch):
+    # Stands in for amulet_nbt: "parsing" returns the inflated payload.
+    module = types.ModuleType("amulet_nbt")
+    module.load = lambda data, compressed=True: bytes(data)
+    monkeypatch.setitem(sys.modules, "amulet_nbt", module)
+    return module
+
+
+def _set_compression(region: Path, offset: int, compression: int) -> None:
+    data = bytearray(region.read_bytes())
+    data[offset + 4] = compression
+    region.write_bytes(bytes(data))
+
+
+@pytest.fixture
+def dimension(tmp_path: Path) -> Path:
+    # Written out of index order: (5, 0) sits before (1, 0) in the file.
+    write_region(tmp_path / "region" / "r.0.0.mca", {(5, 0): b"five", (1, 0): b"one", (2, 3): b"two"})
+    write_region(tmp_path / "entities" / "r.0.0.mca", {(1, 0): b"mob"})
+    return tmp_path
+
+
+def test_coords_follow_region_order(nbt, dimension: Path) -> None:
+    reader = AnvilRegionReader(dimension)
+    assert reader.coords == [(5, 0), (1, 0), (2, 3)]
+    reader.close()
+
+
+def test_reads_region_and_entities_layers(nbt, dimension: Path) -> None:
+    reader = AnvilRegionReader(dimension)
+    assert reader.read((1, 0)) == {"region": b"one", "entities": b"mob"}
+    assert reader.read((5, 0)) == {"region": b"five"}
+    with pytest.raises(KeyError):
+        reader.read((9, 9))
+    reader.close()
+
+    region_only = AnvilRegionReader(dimension, layers=("region",))
+    assert region_only.read((1, 0)) == {"region": b"one"}
+    region_only.close()
+
+
+def test_reads_external_chunks(nbt, dimension: Path) -> None:
+    region = dimension / "region" / "r.0.0.mca"
+    _set_compression(region, 2 * 4096, 0x82)
+    (dimension / "region" / "c.5.0.mcc").write_bytes(zlib.compress(b"oversized"))
+
+    reader = AnvilRegionReader(dimension)
+    assert reader.read((5, 0)) == {"region": b"oversized"}
+    reader.close()
+
+
+def test_unsupported_compression_falls_back(nbt, dimension: Path) -> None:
+    _set_compression(dimension / "region" / "r.0.0.mca", 2 * 4096, 4)
+    reader = AnvilRegionReader(dimension)
+    with pytest.raises(ValueError):
+        reader.read((5, 0))
+
+    stream = ChunkStream(
+        "minecraft:overworld",
+        reader.coords,
+        fetch=lambda keys: {key: reader.read(key) for key in keys},
+    )
+    # The failed chunk is left for amulet's own reader; the rest are prefetched.
+    assert list(stream.prefetch(workers=2, depth=2)) == [
+        ((5, 0), None),
+        ((1, 0), {"region": b"one", "entities": b"mob"}),
+        ((2, 3), {"region": b"two"}),
+    ]
+    reader.close()
+
+
+def test_close_unmaps_region_files(nbt, dimension: Path) -> None:
+    (dimension / "region" / "r.1.0.mca").write_bytes(b"")
+    reader = AnvilRegionReader(dimension)
+    maps = [m for m in reader._maps.values() if m is not None]
+    assert len(maps) == 2
+
+    reader.close()
+    reader.close()
+    assert all(m.closed for m in maps)
+
+
+class FakeLevelDB:
+    def __init__(self, records: dict[bytes, bytes]) -> None:
+        self.records = dict(sorted(records.items()))
+
+    def keys(self):
+        return iter(self.records)
+
+    def iterate(self, start=None, end=None):
+        for key, value in self.records.items():
+            if (start is None or key >= start) and (end is None or key < end):
+                yield key, value
+
+    def get(self, key: bytes) -> bytes:
+        return self.records[key]
+
+
+class ChunkData(dict):
+    # Shaped like amulet's raw Bedrock chunk: records plus actor payloads.
+    def __init__(self) -> None:
+        super().__init__()
+        self.entity_actor: list[bytes] = []
+
+
+def test_read_ahead_keeps_order_within_its_window() -> None:
+    started: list[int] = []
+    lock = threading.Lock()
+
+    def fetch(item: int) -> int:
+        with lock:
+            started.append(item)
+        time.sleep(random.random() / 200)
+        return item * 10
+
+    seen = []
+    for index, (item, result, error) in enumerate(ReadAhead(range(40), fetch, workers=4, depth=5)):
+        with lock:
+            assert len(started) <= index + 5
+        seen.append((item, result, error))
+    assert seen == [(i, i * 10, None) for i in range(40)]
+
+
+def test_failed_batches_are_left_to_amulet() -> None:
+    def fetch(keys):
+        if (2, 0) in keys:
+            raise OSError("bad sector")
+        return {key: f"raw{key[0]}" for key in keys if key != (5, 0)}
+
+    stream = ChunkStream(OVERWORLD, [(i, 0) for i in range(6)], fetch=fetch, batch_size=2)
+    assert list(stream.prefetch(workers=2, depth=4)) == [
+        ((0, 0), "raw0"),
+        ((1, 0), "raw1"),
+        ((2, 0), None),
+        ((3, 0), None),
+        ((4, 0), "raw4"),
+        ((5, 0), None),
+    ]
+    assert list(ChunkStream(OVERWORLD, [(0, 0)]).prefetch(workers=2, depth=4)) == [((0, 0), None)]
+
+
+def test_bedrock_range_reader_groups_wanted_chunks() -> None:
+    records = {b"Overworld": b"level", b"~local_player": b"player"}
+    for cx in range(4):
+        records[bedrock_chunk_prefix(cx, 0, OVERWORLD) + b","] = b"\x28"
+        records[bedrock_chunk_prefix(cx, 0, OVERWORLD) + b"/\x00"] = f"sub{cx}".encode()
+        records[bedrock_chunk_prefix(cx, 0, NETHER) + b","] = b"\x28"
+    db = FakeLevelDB(records)
+
+    plan = bedrock_chunk_plan(db, [OVERWORLD, NETHER])
+    assert [(s.dimension, s.coords) for s in plan] == [
+        (OVERWORLD, [(0, 0), (1, 0), (2, 0), (3, 0)]),
+        (NETHER, [(0, 0), (1, 0), (2, 0), (3, 0)]),
+    ]
+
+    found = BedrockRangeReader(db, OVERWORLD).read([(0, 0), (2, 0)])
+    assert found == {
+        (0, 0): {b",": b"\x28", b"/\x00": b"sub0"},
+        (2, 0): {b",": b"\x28", b"/\x00": b"sub2"},
+    }
+    assert BedrockRangeReader(db, NETHER).read([(1, 0)]) == {(1, 0): {b",": b"\x28"}}
+
+
+def test_bedrock_range_reader_collects_actors() -> None:
+    prefix = bedrock_chunk_prefix(0, 0, OVERWORLD)
+    db = FakeLevelDB(
+        {
+            prefix + b",": b"\x28",
+            b"digp" + prefix: struct.pack("<qq", 1, 2),
+            b"actorprefix" + struct.pack("<q", 1): b"zombie",
+            bedrock_chunk_prefix(1, 0, OVERWORLD) + b",": b"\x28",
+        }
+    )
+    found = BedrockRangeReader(db, OVERWORLD, ChunkData).read([(0, 0), (1, 0)])
+
+    assert found[(0, 0)] == {b",": b"\x28"}
+    assert found[(0, 0)].entity_actor == [b"zombie"]
+    assert found[(1, 0)].entity_actor == []
+
+
+def test_prefetched_chunks_restore_the_reader() -> None:
+    class LevelWrapper:
+        def _get_raw_chunk_data(self, cx, cz, dimension):
+            return "direct"
+
+    wrapper = LevelWrapper()
+    with PrefetchedChunks(wrapper).installed() as prefetched:
+        prefetched.put(0, 0, OVERWORLD, "prefetched")
+        prefetched.put(1, 0, OVERWORLD, "dropped")
+        prefetched.discard(1, 0, OVERWORLD)
+        assert wrapper._get_raw_chunk_data(0, 0, OVERWORLD) == "prefetched"
+        assert wrapper._get_raw_chunk_data(0, 0, OVERWORLD) == "direct"
+        assert wrapper._get_raw_chunk_data(1, 0, OVERWORLD) == "direct"
+    assert "_get_raw_chunk_data" not in vars(wrapper)
+
+    def filtered(cx, cz, dimension):
+        return "filtered"
+
+    wrapper._get_raw_chunk_data = filtered
+    with PrefetchedChunks(wrapper).installed():
+        assert wrapper._get_raw_chunk_data(0, 0, OVERWORLD) == "filtered"
+    assert wrapper._get_raw_chunk_data is filtered
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+from mcconvert_ui.scan import (
+    END,
+    NETHER,
+    OVERWORLD,
+    bedrock_chunk_prefix,
+    detect_platform,
+    iter_bedrock_chunks,
+    parse_bedrock_chunk_key,
+    read_region_header,
+    scan_chunks,
+)
+
+
+def test_read_region_header(java_world: Path) -> None:
+    entries = read_region_header(java_world / "region" / "r.-1.0.mca")
+    assert [(e.cx, e.cz, e.offset, e.timestamp) for e in entries] == [(-1, 2, 8192, 1)]
+
+
+def test_scan_java_chunks(java_world: Path) -> None:
+    assert detect_platform(java_world) == "java"
+    assert scan_chunks(java_world) == {
+        OVERWORLD: {(0, 0), (1, 0), (-1, 2)},
+        NETHER: {(3, 4)},
+    }
+
+
+def test_parse_bedrock_chunk_key() -> None:
+    assert parse_bedrock_chunk_key(struct.pack("<ii", -1, 2) + b"/\x03") == (
+        OVERWORLD,
+        -1,
+        2,
+        b"/\x03",
+    )
+    assert parse_bedrock_chunk_key(struct.pack("<iii", 4, 5, 1) + b",") == (NETHER, 4, 5, b",")
+    assert parse_bedrock_chunk_key(struct.pack("<iii", 4, 5, 9) + b",") is None
+    assert parse_bedrock_chunk_key(b"~local_player") is None
+
+
+def test_bedrock_chunk_prefix_round_trip() -> None:
+    for dimension in (OVERWORLD, NETHER, END):
+        key = bedrock_chunk_prefix(-5, 7, dimension) + b","
+        assert parse_bedrock_chunk_key(key) == (dimension, -5, 7, b",")
+
+
+def test_iter_bedrock_chunks_ignores_level_records() -> None:
+    class FakeDB:
+        def keys(self):
+            return iter(
+                [
+                    b"Overworld",
+                    b"scoreboard",
+                    bedrock_chunk_prefix(1, 2, OVERWORLD) + b",",
+                    bedrock_chunk_prefix(1, 2, OVERWORLD) + b"/\x00",
+                ]
+            )
+
+    assert list(iter_bedrock_chunks(FakeDB())) == [(OVERWORLD, 1, 2)]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from mcconvert_ui import converter, staging
+from mcconvert_ui.converter import ConversionResult, convert_world
+from mcconvert_ui.staging import IOThrottle, copy_tree, publish, staging_path
+
+
+def _staged_world(tmp_path: Path) -> Path:
+    staged = staging_path(tmp_path / "scratch", tmp_path / "out" / "world")
+    (staged / "region").mkdir(parents=True)
+    (staged / "level.dat").write_bytes(b"level")
+    (staged / "region" / "r.0.0.mca").write_bytes(b"region")
+    return staged
+
+
+def test_publish_renames_into_place(tmp_path: Path) -> None:
+    staged = _staged_world(tmp_path)
+    output = tmp_path / "out" / "world"
+    output.mkdir(parents=True)
+
+    publish(staged, output)
+
+    assert not staged.exists()
+    assert (output / "region" / "r.0.0.mca").read_bytes() == b"region"
+
+
+def test_publish_refuses_non_empty_output(tmp_path: Path) -> None:
+    staged = _staged_world(tmp_path)
+    output = tmp_path / "out" / "world"
+    output.mkdir(parents=True)
+    (output / "keep").write_bytes(b"")
+
+    with pytest.raises(OSError):
+        publish(staged, output)
+    assert staged.exists()
+
+
+def test_publish_copies_across_filesystems(tmp_path: Path, monkeypatch) -> None:
+    staged = _staged_world(tmp_path)
+    output = tmp_path / "out" / "world"
+    output.parent.mkdir(parents=True)
+    real_rename = os.rename
+
+    def rename(source, target):
+        if Path(source) == staged:
+            raise OSError(errno.EXDEV, "cross-device link")
+        real_rename(source, target)
+
+    monkeypatch.setattr(staging.os, "rename", rename)
+    publish(staged, output)
+
+    assert not staged.exists()
+    assert (output / "level.dat").read_bytes() == b"level"
+    assert [p.name for p in output.parent.iterdir()] == ["world"]
+
+
+def test_throttled_copy_tree(tmp_path: Path) -> None:
+    staged = _staged_world(tmp_path)
+    target = tmp_path / "copy"
+    copy_tree(staged, target, IOThrottle(1024 * 1024))
+    assert (target / "region" / "r.0.0.mca").read_bytes() == b"region"
+
+
+def test_staged_conversion_creates_output_parent(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+
+    def fake_convert(input_path, output_path, **options):
+        (output_path / "level.dat").write_bytes(b"converted")
+        return ConversionResult(True, "ok")
+
+    monkeypatch.setattr(converter, "_convert_into", fake_convert)
+    output = tmp_path / "missing" / "parent" / "world"
+    result = convert_world(source, output, "java-to-java", staging_dir=tmp_path / "scratch")
+
+    assert result.success, result.details
+    assert (output / "level.dat").read_bytes() == b"converted"
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+
+def test_io_limit_without_staging_warns(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    throttles: list = []
+
+    def fake_convert(input_path, output_path, throttle=None, **options):
+        throttles.append(throttle)
+        return ConversionResult(True, "ok")
+
+    monkeypatch.setattr(converter, "_convert_into", fake_convert)
+    messages: list[str] = []
+    result = convert_world(
+        source, tmp_path / "out", "java-to-java", log=messages.append, io_limit=1024
+    )
+
+    assert result.success
+    assert isinstance(throttles[0], IOThrottle)
+    assert any("io_limit" in message for message in messages)
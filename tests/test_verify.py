@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mcconvert_ui import verify
+from mcconvert_ui.scan import NETHER, OVERWORLD
+from mcconvert_ui.verify import verify_conversion
+
+
+@pytest.fixture
+def converted(java_world: Path, tmp_path: Path, monkeypatch) -> Path:
+    output = tmp_path / "converted"
+    shutil.copytree(java_world, output)
+    metadata = {java_world: {"LevelName": "old", "Seed": 1}, output: {"LevelName": "new"}}
+    monkeypatch.setattr(verify, "_read_metadata", lambda world: metadata[world])
+    monkeypatch.setattr(
+        verify,
+        "_sample_block_names",
+        lambda world, samples: {key: {"minecraft:stone"} for key in samples},
+    )
+    return output
+
+
+def test_metadata_diffs_do_not_fail(java_world: Path, converted: Path) -> None:
+    report = verify_conversion(java_world, converted)
+
+    assert report.ok
+    assert report.sampled == 4
+    assert report.metadata_diffs == {"LevelName": ("old", "new"), "Seed": (1, None)}
+    assert "仅供参考" in report.summary()
+
+
+def test_missing_chunks_fail(java_world: Path, converted: Path) -> None:
+    shutil.rmtree(converted / "DIM-1")
+    report = verify_conversion(java_world, converted)
+
+    assert not report.ok
+    assert report.dimensions[NETHER].missing == 1
+
+
+def test_skipped_dimensions_are_not_compared(java_world: Path, converted: Path) -> None:
+    shutil.rmtree(converted / "DIM-1")
+    report = verify_conversion(java_world, converted, skipped_dimensions=[NETHER])
+
+    assert report.ok
+    assert list(report.dimensions) == [OVERWORLD]
+    assert report.skipped_dimensions == [NETHER]